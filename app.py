@@ -3,60 +3,50 @@ from components.layout import setup_page_config, apply_custom_css
 from components.sidebar import render_sidebar
 from components.viz_piechart import render_piechart_visualization
 from components.viz_table import render_table_visualization
-import pandas as pd
+from components.data_refresher import get_refresher
+from components import perf
 
-# Force reload modules untuk development
 import importlib
+import os
 import sys
 
-# Reload modules jika ada perubahan
-modules_to_reload = ['components.layout', 'components.sidebar', 'components.viz_piechart', 'components.viz_table']
-for module_name in modules_to_reload:
-    if module_name in sys.modules:
-        importlib.reload(sys.modules[module_name])
+# Mode development (HIGHFIVE_DEV=1): reload modules di setiap rerun supaya perubahan kode langsung terpakai.
+# Di produksi modul hanya dieksekusi sekali per proses.
+DEV_MODE = os.environ.get("HIGHFIVE_DEV") == "1"
+
+if DEV_MODE:
+    modules_to_reload = ['components.data_loader', 'components.aggregates', 'components.dataset', 'components.data_refresher', 'components.fragment_cache', 'components.perf', 'components.layout', 'components.sidebar', 'components.viz_piechart', 'components.viz_table']
+    for module_name in modules_to_reload:
+        if module_name in sys.modules:
+            importlib.reload(sys.modules[module_name])
 
 # Setup page
 setup_page_config()
+perf.begin_rerun()
 apply_custom_css()
 
+# Warm-up semua sumber data (DPS & DGS) secara paralel sejak script run pertama
+get_refresher()
+
 # Fungsi untuk load data dari Google Sheets
-@st.cache_data(ttl=300)
 def load_data(data_source):
-    """Load data dari Google Sheets berdasarkan DPS/DGS"""
+    """
+    Load Dataset DPS/DGS dari refresher background.
+    Langsung mengembalikan Dataset terakhir yang valid; refresh ke Google Sheets berjalan di thread terpisah.
+    Jika refresh terakhir gagal, error ditampilkan dan data terakhir yang valid tetap dipakai.
+    """
+    refresher = get_refresher()
     try:
-        # Mapping DPS/DGS ke spreadsheet URL yang berbeda
-        sheet_configs = {
-            "DPS": "1K-596RSSwJWO1HiAwOBG2gnMSUtrEhvnKIdH8P4w8e4",
-            "DGS": "1QazP2uYyoPNZU8qfJuAevHFyJP0SmaSwYSc7JXTchCo"
-        }
-        
-        sheet_id = sheet_configs.get(data_source)
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-        
-        df = pd.read_csv(csv_url)
-        
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        
-        # Clean NILAI - convert to numeric
-        if 'NILAI' in df.columns:
-            df['NILAI'] = pd.to_numeric(df['NILAI'], errors='coerce')
-        
-        # Clean % Results
-        if '% Results' in df.columns:
-            df['% Results'] = df['% Results'].astype(str).str.replace('%', '').str.strip()
-            df['% Results'] = pd.to_numeric(df['% Results'], errors='coerce')
-        
-        # Clean % Progress
-        if '% Progress' in df.columns:
-            df['% Progress'] = df['% Progress'].astype(str).str.replace('%', '').str.strip()
-            df['% Progress'] = pd.to_numeric(df['% Progress'], errors='coerce')
-        
-        return df
+        dataset = refresher.get(data_source)
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return None
 
+    error = refresher.last_error(data_source)
+    if error is not None:
+        st.error(f"Error loading data: {str(error)} (menampilkan data terakhir yang berhasil dimuat)")
+    return dataset
+
 # Initialize session state untuk filter data source
 if 'data_source' not in st.session_state:
     st.session_state.data_source = "DPS"
@@ -66,7 +56,8 @@ if 'view_mode' not in st.session_state:
     st.session_state.view_mode = 'card'
 
 # Render sidebar dan dapatkan selected_witel
-selected_witel = render_sidebar()
+with perf.span("sidebar"):
+    selected_witel = render_sidebar()
 
 # Header dengan Button Group Filter
 col_title, col_spacer, col_filter = st.columns([2, 1, 1])
@@ -105,10 +96,12 @@ with col_filter:
 st.markdown("<br>", unsafe_allow_html=True)
 
 # Load data berdasarkan filter yang dipilih
-with st.spinner(f"⏳ Memuat data {st.session_state.data_source}..."):
-    df = load_data(st.session_state.data_source)
+with st.spinner(f"⏳ Memuat data {st.session_state.data_source}..."), perf.span("load_data"):
+    dataset = load_data(st.session_state.data_source)
+
+if dataset is not None:
+    df = dataset.frame
 
-if df is not None:
     # Cek apakah witel sudah dipilih
     if selected_witel == "-- Pilih Witel --":
         # Tampilan sebelum filter
@@ -166,8 +159,9 @@ if df is not None:
         
         st.dataframe(df.head(10), use_container_width=True, height=400)
     else:
-        # Filter data berdasarkan witel
-        filtered_df = df[df['WITEL'] == selected_witel].copy()
+        # Ambil partisi witel (sudah dipecah sekali per versi data, read-only)
+        with perf.span("witel_filter"):
+            filtered_df = dataset.for_witel(selected_witel)
         
         if len(filtered_df) == 0:
             # Warning dengan styling modern
@@ -197,7 +191,10 @@ if df is not None:
             """, unsafe_allow_html=True)
         else:
             # Section 1: Monitoring Produk Witel (Pie Charts)
-            render_piechart_visualization(filtered_df, selected_witel)
+            with perf.span("summary"):
+                summary = dataset.summary(selected_witel)
+            with perf.span("piechart"):
+                render_piechart_visualization(filtered_df, selected_witel, summary, dataset)
             
             # Divider dengan styling modern
             st.markdown("""
@@ -207,7 +204,8 @@ if df is not None:
             """, unsafe_allow_html=True)
             
             # Section 2: Progress Account Manager
-            render_table_visualization(filtered_df, selected_witel)
+            with perf.span("account_manager"):
+                render_table_visualization(filtered_df, selected_witel, summary, dataset)
 
 else:
     # Error dengan styling modern
@@ -251,4 +249,12 @@ st.markdown("""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Timing rerun ini (JSON log / panel debug, hanya jika diaktifkan)
+perf.finish_rerun(
+    source=st.session_state.data_source,
+    witel=selected_witel,
+    view_mode=st.session_state.view_mode,
+)
+perf.render_panel()
@@ -0,0 +1,130 @@
+"""
+Cek budget performa profil produksi (tanpa HIGHFIVE_DEV): waktu import modul dashboard,
+import berat yang harus tetap lazy, dan median waktu rerun halaman utama.
+Exit code 1 jika ada budget yang terlewati, jadi bisa dipakai sebagai gate di CI.
+Budget yang sama juga dicek oleh tests/test_budget.py saat pytest.
+
+    python -m benchmarks.check_budget --rows 20000
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# app.py dashboard (absolut, supaya gate bisa dijalankan dari folder mana pun)
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+# Budget default (ms), diukur di laptop dev dengan sheet sintetis 20k baris
+IMPORT_BUDGET_MS = 150
+RERUN_BUDGET_MS = {
+    'landing': 100,
+    'card': 200,
+    'table': 200,
+}
+
+# Package berat yang tidak boleh ikut ter-load hanya karena modul dashboard di-import.
+# Dicek sebagai selisih terhadap modul yang sudah di-load streamlit sendiri
+# (Streamlit 1.31 sudah meng-import sebagian plotly dan PIL saat `import streamlit`).
+LAZY_PACKAGES = ('plotly', 'PIL')
+
+DASHBOARD_MODULES = [
+    'components.layout',
+    'components.sidebar',
+    'components.viz_piechart',
+    'components.viz_table',
+    'components.data_refresher',
+]
+
+IMPORT_PROBE = """
+import importlib, json, sys, time
+import streamlit, pandas, pyarrow
+baseline = set(sys.modules)
+started = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+print(json.dumps({{
+    'import_ms': (time.perf_counter() - started) * 1000,
+    'loaded': sorted(name for name in set(sys.modules) - baseline if name.split('.')[0] in {lazy!r}),
+}}))
+"""
+
+def measure_import(repeat=3):
+    """Waktu import modul dashboard di proses baru (streamlit/pandas/pyarrow sudah di-import dulu)"""
+    probe = IMPORT_PROBE.format(modules=DASHBOARD_MODULES, lazy=LAZY_PACKAGES)
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result['import_ms'])
+
+def median_rerun_ms(at, repeat):
+    """Median waktu rerun AppTest tanpa perubahan widget (ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+def measure_reruns(rows, witel, repeat, raw=None):
+    """
+    Median rerun halaman landing, card mode dan table mode dengan sheet sintetis dari server lokal.
+    raw: CSV yang sudah di-generate (default: generate_csv(rows) dengan 45 AM per WITEL).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.sheet_server import SheetServer, use_local_sheet
+    from benchmarks.synthetic import generate_csv
+
+    with SheetServer(raw or generate_csv(rows, ams_per_witel=45)) as server:
+        use_local_sheet(server)
+        at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+        at.run()
+
+        timings = {'landing': median_rerun_ms(at, repeat)}
+
+        at.sidebar.selectbox(key="witel_filter").select(witel).run()
+        timings['card'] = median_rerun_ms(at, repeat)
+
+        at.button(key="btn_table_view").click().run()
+        timings['table'] = median_rerun_ms(at, repeat)
+
+        if at.exception:
+            raise RuntimeError(f"App error saat benchmark: {at.exception}")
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--witel", default="BALI")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    failures = []
+
+    imported = measure_import()
+    print(f"{'import':>8}: {imported['import_ms']:8.1f} ms  (budget {args.import_budget:.0f} ms)")
+    if imported['import_ms'] > args.import_budget:
+        failures.append(f"import {imported['import_ms']:.1f} ms > {args.import_budget:.0f} ms")
+    if imported['loaded']:
+        failures.append(f"import berat tidak lazy: {', '.join(imported['loaded'][:5])}")
+
+    for name, ms in measure_reruns(args.rows, args.witel, args.repeat).items():
+        budget = RERUN_BUDGET_MS[name]
+        print(f"{name:>8}: {ms:8.1f} ms  (budget {budget} ms)")
+        if ms > budget:
+            failures.append(f"rerun {name} {ms:.1f} ms > {budget} ms")
+
+    if failures:
+        print("\nBUDGET TERLEWATI:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nSemua budget terpenuhi")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Load test sesi paralel: jalankan `streamlit run app.py` sungguhan dengan sheet sintetis dari
+server lokal, lalu simulasikan N sesi browser (websocket) yang berganti WITEL, DPS/DGS dan
+view mode. Laporan: persentil latensi rerun per aksi serta CPU/memori proses server.
+
+    python -m benchmarks.load_test --sessions 30 --actions 20 --output bench/load.json
+
+psutil dipakai jika ter-install; tanpa psutil sampling dibaca dari /proc (Linux), dan total CPU /
+peak RSS server tetap dilaporkan dari resource.getrusage setelah server berhenti.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from tornado.websocket import websocket_connect
+
+from benchmarks.run import git_commit
+from benchmarks.sheet_server import SheetServer
+from benchmarks.synthetic import generate_csv
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Batas waktu satu rerun sebelum dihitung error (detik)
+RERUN_TIMEOUT = 60
+
+# Interval sampling CPU/memori proses server (detik)
+SAMPLE_INTERVAL = 0.5
+
+PERCENTILES = (50, 90, 95, 99)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(port, sheet_url, snapshot_dir):
+    """Jalankan streamlit run app.py headless (profil produksi) yang membaca sheet dari server lokal"""
+    env = dict(
+        os.environ,
+        HIGHFIVE_EXPORT_URL=sheet_url,
+        HIGHFIVE_SNAPSHOT_DIR=snapshot_dir,
+    )
+    env.pop('HIGHFIVE_DEV', None)
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "app.py",
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+def wait_healthy(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server streamlit tidak siap dalam {timeout} detik")
+
+class ResourceSampler(threading.Thread):
+    """Sampling CPU (% satu core) dan RSS proses server selama load test"""
+
+    def __init__(self, pid):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.pid = pid
+        self.samples = []
+        self._stopped = threading.Event()
+
+    def _read(self):
+        """Return (cpu detik kumulatif, rss byte)"""
+        if psutil is not None:
+            proc = psutil.Process(self.pid)
+            cpu = proc.cpu_times()
+            return cpu.user + cpu.system, proc.memory_info().rss
+
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        rss = int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+
+    def run(self):
+        try:
+            last_cpu, _ = self._read()
+        except OSError:
+            return
+        last_time = time.monotonic()
+        while not self._stopped.wait(SAMPLE_INTERVAL):
+            try:
+                cpu, rss = self._read()
+            except OSError:
+                return
+            now = time.monotonic()
+            self.samples.append({'cpu_pct': (cpu - last_cpu) / (now - last_time) * 100, 'rss': rss})
+            last_cpu, last_time = cpu, now
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def summary(self):
+        if not self.samples:
+            return {}
+        cpu = [sample['cpu_pct'] for sample in self.samples]
+        rss = [sample['rss'] for sample in self.samples]
+        return {
+            'cpu_pct_mean': round(sum(cpu) / len(cpu), 1),
+            'cpu_pct_max': round(max(cpu), 1),
+            'rss_mb_start': round(rss[0] / 2**20, 1),
+            'rss_mb_max': round(max(rss) / 2**20, 1),
+            'samples': len(self.samples),
+            'source': 'psutil' if psutil is not None else '/proc',
+        }
+
+class Session:
+    """Satu sesi browser: kirim rerun dengan widget state, tunggu script selesai"""
+
+    def __init__(self, port, rng):
+        self.port = port
+        self.rng = rng
+        self.conn = None
+        self.widgets = {}
+        self.witel_index = 0
+        self.source = 'DPS'
+        self.view_mode = 'card'
+
+    async def connect(self):
+        self.conn = await websocket_connect(
+            f"ws://127.0.0.1:{self.port}/_stcore/stream", subprotocols=["streamlit"]
+        )
+
+    def _remember_widget(self, msg):
+        """Catat id dan opsi widget (berdasarkan key) dari delta elemen baru"""
+        if msg.WhichOneof('type') != 'delta' or msg.delta.WhichOneof('type') != 'new_element':
+            return
+        element = msg.delta.new_element
+        kind = element.WhichOneof('type')
+        widget = getattr(element, kind) if kind else None
+        widget_id = getattr(widget, 'id', '')
+        if widget_id.startswith('$$WIDGET_ID-'):
+            key = widget_id.split('-', 2)[2]
+            self.widgets[key] = widget
+
+    async def rerun(self, trigger=None):
+        """Satu rerun (termasuk st.rerun di server) sampai FINISHED_SUCCESSFULLY; return byte diterima"""
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        states = back.rerun_script.widget_states.widgets
+        if 'witel_filter' in self.widgets:
+            state = states.add()
+            state.id = self.widgets['witel_filter'].id
+            state.int_value = self.witel_index
+        if trigger is not None:
+            state = states.add()
+            state.id = self.widgets[trigger].id
+            state.trigger_value = True
+        await self.conn.write_message(back.SerializeToString(), binary=True)
+
+        received = 0
+        while True:
+            raw = await self.conn.read_message()
+            if raw is None:
+                raise ConnectionError("Websocket ditutup server")
+            received += len(raw)
+            msg = ForwardMsg.FromString(raw)
+            self._remember_widget(msg)
+            if msg.WhichOneof('type') == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    return received
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("Script app.py gagal di-compile")
+
+    def next_action(self):
+        """Pilih aksi berikutnya: ganti WITEL, ganti DPS/DGS, atau ganti view mode"""
+        if self.witel_index == 0:
+            return 'witel'
+        return self.rng.choice(('witel', 'witel', 'source', 'view'))
+
+    def apply(self, action):
+        """Ubah state lokal untuk aksi; return key tombol yang diklik (atau None)"""
+        if action == 'witel':
+            options = len(self.widgets['witel_filter'].options)
+            self.witel_index = self.rng.choice([i for i in range(1, options) if i != self.witel_index])
+            return None
+        if action == 'source':
+            self.source = 'DGS' if self.source == 'DPS' else 'DPS'
+            return f"btn_{self.source.lower()}"
+        self.view_mode = 'table' if self.view_mode == 'card' else 'card'
+        return f"btn_{self.view_mode}_view"
+
+async def run_session(port, actions, think, seed, records, started_at):
+    """Jalankan satu sesi: load awal lalu sejumlah aksi dengan jeda acak di antaranya"""
+    session = Session(port, random.Random(seed))
+    try:
+        await session.connect()
+        await timed_rerun(session, 'initial', None, records)
+        for _ in range(actions):
+            await asyncio.sleep(session.rng.uniform(0, think))
+            action = session.next_action()
+            await timed_rerun(session, action, session.apply(action), records)
+    except Exception as e:
+        records.append({'action': 'error', 'error': f"{type(e).__name__}: {e}", 'at': time.monotonic() - started_at})
+    finally:
+        if session.conn is not None:
+            session.conn.close()
+
+async def timed_rerun(session, action, trigger, records):
+    started = time.perf_counter()
+    received = await asyncio.wait_for(session.rerun(trigger), RERUN_TIMEOUT)
+    records.append({
+        'action': action,
+        'ms': (time.perf_counter() - started) * 1000,
+        'bytes': received,
+        'source': session.source,
+        'view_mode': session.view_mode,
+    })
+
+def percentile(values, pct):
+    """Persentil nearest-rank dari list yang sudah diurutkan (rank = ceil(pct/100 * n))"""
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+def latency_summary(records):
+    timings = sorted(record['ms'] for record in records)
+    if not timings:
+        return {'count': 0}
+    summary = {'count': len(timings), 'mean_ms': round(sum(timings) / len(timings), 1)}
+    for pct in PERCENTILES:
+        summary[f'p{pct}_ms'] = round(percentile(timings, pct), 1)
+    summary['max_ms'] = round(timings[-1], 1)
+    summary['kb_mean'] = round(sum(record['bytes'] for record in records) / len(records) / 1024, 1)
+    return summary
+
+async def run_load(port, sessions, actions, think, ramp, seed):
+    records = []
+    started_at = time.monotonic()
+
+    async def delayed(index):
+        await asyncio.sleep(ramp * index / max(sessions, 1))
+        await run_session(port, actions, think, seed + index, records, started_at)
+
+    await asyncio.gather(*(delayed(index) for index in range(sessions)))
+    return records, time.monotonic() - started_at
+
+def server_rusage(before):
+    """
+    Total CPU dan peak RSS proses anak (server streamlit) setelah selesai, dari resource.getrusage.
+    before: getrusage sebelum server dijalankan (CPU proses anak sebelumnya dikurangkan).
+    Panggil sebelum subprocess lain (misal git_commit) supaya CPU-nya tidak ikut terhitung.
+    """
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    maxrss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    return {
+        'cpu_user_s': round(usage.ru_utime - before.ru_utime, 2),
+        'cpu_system_s': round(usage.ru_stime - before.ru_stime, 2),
+        'maxrss_mb': round(maxrss / 2**20, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="jumlah sesi paralel")
+    parser.add_argument("--actions", type=int, default=10, help="jumlah aksi per sesi setelah load awal")
+    parser.add_argument("--think", type=float, default=1.0, help="jeda maksimal antar aksi (detik)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="waktu membuka semua sesi (detik)")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--ams-per-witel", type=int, default=45)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=0, help="port server (default: port bebas)")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    args = parser.parse_args()
+
+    port = args.port or free_port()
+    rusage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    with SheetServer(generate_csv(args.rows, ams_per_witel=args.ams_per_witel, seed=args.seed)) as sheet:
+        server = start_server(port, sheet.url, tempfile.mkdtemp(prefix="highfive-load-"))
+        try:
+            wait_healthy(port)
+            # Satu sesi pemanasan supaya load data awal (refresher) tidak ikut terukur
+            asyncio.run(run_load(port, 1, 1, 0, 0, args.seed - 1))
+
+            sampler = ResourceSampler(server.pid)
+            sampler.start()
+            records, elapsed = asyncio.run(
+                run_load(port, args.sessions, args.actions, args.think, args.ramp, args.seed)
+            )
+            sampler.stop()
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    server_usage = dict(sampler.summary(), **server_rusage(rusage_before))
+
+    errors = [record for record in records if record['action'] == 'error']
+    reruns = [record for record in records if record['action'] != 'error']
+    by_action = {}
+    for record in reruns:
+        by_action.setdefault(record['action'], []).append(record)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'params': {
+            'sessions': args.sessions,
+            'actions': args.actions,
+            'think_s': args.think,
+            'ramp_s': args.ramp,
+            'rows': args.rows,
+            'ams_per_witel': args.ams_per_witel,
+            'seed': args.seed,
+        },
+        'duration_s': round(elapsed, 2),
+        'throughput_rps': round(len(reruns) / elapsed, 2) if elapsed else None,
+        'errors': len(errors),
+        'latency': latency_summary(reruns),
+        'latency_by_action': {action: latency_summary(items) for action, items in sorted(by_action.items())},
+        'server': server_usage,
+    }
+
+    latency = report['latency']
+    if not reruns:
+        print("Tidak ada rerun yang berhasil")
+        for error in errors[:5]:
+            print(f"  error: {error['error']}")
+        sys.exit(1)
+    print(f"{args.sessions} sesi x {args.actions} aksi: {latency['count']} rerun dalam {elapsed:.1f} s "
+          f"({report['throughput_rps']} rerun/s), {len(errors)} error")
+    print(f"{'aksi':>10} {'n':>5} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for action, summary in [('semua', latency)] + list(report['latency_by_action'].items()):
+        print(f"{action:>10} {summary['count']:>5} {summary['p50_ms']:>8} {summary['p90_ms']:>8} "
+              f"{summary['p95_ms']:>8} {summary['p99_ms']:>8} {summary['max_ms']:>8}")
+    print("server: " + ", ".join(f"{key}={value}" for key, value in report['server'].items()))
+    for error in errors[:5]:
+        print(f"  error: {error['error']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil ditulis ke {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Benchmark suite dashboard High Five dengan sheet sintetis.
+
+Mengukur load data (server HTTP lokal pengganti Google Sheets), kalkulasi kategori,
+agregasi AM, render card/table mode (AppTest headless) dan rerun app penuh.
+Hasil ditulis sebagai JSON supaya bisa dibandingkan antar commit:
+
+    python -m benchmarks.run --rows 20000 --output bench/main.json
+    python -m benchmarks.run --rows 20000 --compare bench/main.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit
+
+from benchmarks.check_budget import measure_reruns
+from benchmarks.sheet_server import SheetServer, use_local_sheet
+from benchmarks.synthetic import generate_csv
+from components import data_loader
+from components.aggregates import build_cube, summarize_ams
+from components.dataset import Dataset
+from components.viz_piechart import calculate_category_breakdown, calculate_category_stats, calculate_category_win_lose
+
+# Selisih median (relatif ke baseline) yang dianggap regresi saat --compare
+REGRESSION_THRESHOLD = 0.10
+
+def measure(func, repeat, warmup=1):
+    """Jalankan func beberapa kali, return statistik waktu (ms)"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'repeat': repeat,
+    }
+
+def bench_load(server, repeat):
+    """Load sheet: download penuh + parse, revalidasi (304) dan baca snapshot, lalu build Dataset"""
+    source = next(iter(data_loader.SHEET_CONFIGS))
+    results = {}
+
+    def cold():
+        data_loader.clear_snapshots()
+        data_loader.load_sheet(source, max_age=0)
+
+    results['load_data.cold'] = measure(cold, repeat, warmup=0)
+    results['load_data.revalidate_304'] = measure(lambda: data_loader.load_sheet(source, max_age=0), repeat)
+    results['load_data.snapshot'] = measure(lambda: data_loader.load_sheet(source), repeat)
+
+    df, _ = data_loader.load_sheet(source)
+    results['dataset.build'] = measure(lambda: Dataset(source, df, 'bench'), repeat, warmup=0)
+
+    # Refresh dengan satu sel % Progress berubah: Dataset baru dibangun dari delta versi sebelumnya
+    previous = Dataset(source, df, 'bench')
+    for witel in previous.witels:
+        previous.summary(witel)
+    changed = df.copy()
+    changed.loc[changed.index[0], '% Progress'] = 1.5
+    results['dataset.delta'] = measure(lambda: Dataset(source, changed, 'bench-delta', previous=previous), repeat)
+    return df, results
+
+def bench_aggregations(df, witel, repeat):
+    """Kalkulasi kategori (fungsi publik viz_piechart) dan agregasi AM untuk satu WITEL"""
+    dataset = Dataset('BENCH', df, 'bench')
+    witel_df = dataset.for_witel(witel)
+    categories = list(calculate_category_stats(witel_df))
+
+    def per_category(func):
+        return lambda: [func(witel_df, category) for category in categories]
+
+    return {
+        'category.stats': measure(lambda: calculate_category_stats(witel_df), repeat),
+        'category.breakdown': measure(per_category(calculate_category_breakdown), repeat),
+        'category.win_lose': measure(per_category(calculate_category_win_lose), repeat),
+        'am.aggregation': measure(lambda: summarize_ams(build_cube(witel_df)), repeat),
+        'summary.memoized': measure(lambda: dataset.summary(witel), repeat),
+    }
+
+def _render_script():
+    """Script AppTest: render card/table mode saja untuk Dataset dari parquet (parameter di session_state)"""
+    import pandas as pd
+    import streamlit as st
+
+    from components.dataset import Dataset
+    from components.viz_table import render_card_mode, render_table_mode
+
+    @st.cache_resource
+    def load(path):
+        return Dataset('BENCH', pd.read_parquet(path), 'bench')
+
+    dataset = load(st.session_state.bench_parquet)
+    witel = st.session_state.bench_witel
+    df = dataset.for_witel(witel)
+
+    if st.session_state.bench_mode == 'card':
+        render_card_mode(df, dataset.summary(witel)['am_groups'])
+    else:
+        render_table_mode(df, dataset, witel)
+
+def bench_render(df, witel, repeat):
+    """render_card_mode (tertutup dan semua AM di halaman dibuka) dan render_table_mode di AppTest"""
+    from streamlit.testing.v1 import AppTest
+
+    parquet = Path(tempfile.mkdtemp(prefix="highfive-bench-")) / "bench.parquet"
+    df.to_parquet(parquet, index=False)
+
+    def app(mode):
+        at = AppTest.from_function(_render_script, default_timeout=120)
+        at.session_state.bench_parquet = str(parquet)
+        at.session_state.bench_witel = witel
+        at.session_state.bench_mode = mode
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"Render error saat benchmark ({mode}): {at.exception}")
+        return at
+
+    results = {}
+    at = app('card')
+    results['render.card'] = measure(at.run, repeat, warmup=0)
+
+    for toggle in at.toggle:
+        toggle.set_value(True)
+    at.run()
+    results['render.card_open'] = measure(at.run, repeat, warmup=0)
+    results['render.card_open']['ams_open'] = len(at.toggle)
+
+    at = app('table')
+    results['render.table'] = measure(at.run, repeat, warmup=0)
+    return results
+
+def git_commit():
+    """Commit aktif (kosong jika bukan git checkout)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def compare(report, baseline_path, threshold):
+    """Cetak perbandingan median dengan baseline, return daftar benchmark yang regresi"""
+    baseline_report = json.loads(Path(baseline_path).read_text())
+    baseline = baseline_report['results']
+    results = report['results']
+    regressions = []
+    print(f"\nDibanding {baseline_path} (commit {baseline_report.get('commit') or '?'}):")
+    if baseline_report.get('params') != report['params']:
+        print("  PERINGATAN: parameter sheet berbeda dengan baseline, angka tidak sebanding")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:>26}: {result['median_ms']:10.2f} ms  (baru)")
+            continue
+        delta = result['median_ms'] / base['median_ms'] - 1 if base['median_ms'] else 0
+        flag = "  REGRESI" if delta > threshold else ""
+        print(f"{name:>26}: {result['median_ms']:10.2f} ms  vs {base['median_ms']:10.2f} ms  ({delta:+6.1%}){flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--witels", type=int, default=8)
+    parser.add_argument("--ams-per-witel", type=int, default=45)
+    parser.add_argument("--customers-per-am", type=int, default=8)
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--witel", default="BALI", help="WITEL yang dipakai benchmark per-WITEL")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-app", action="store_true", help="lewati rerun app penuh")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    parser.add_argument("--compare", help="file JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    shape = {
+        'rows': args.rows,
+        'witels': args.witels,
+        'ams_per_witel': args.ams_per_witel,
+        'customers_per_am': args.customers_per_am,
+        'products': args.products,
+        'categories': args.categories,
+        'seed': args.seed,
+    }
+    raw = generate_csv(**shape)
+
+    results = {}
+    with SheetServer(raw) as server:
+        use_local_sheet(server)
+        df, load_results = bench_load(server, args.repeat)
+        results.update(load_results)
+
+    results.update(bench_aggregations(df, args.witel, args.repeat))
+    results.update(bench_render(df, args.witel, args.repeat))
+
+    if not args.skip_app:
+        for name, ms in measure_reruns(args.rows, args.witel, args.repeat, raw=raw).items():
+            results[f'app.rerun_{name}'] = {'median_ms': round(ms, 3), 'repeat': args.repeat}
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'streamlit': streamlit.__version__,
+        'params': dict(shape, witel=args.witel, csv_bytes=len(raw)),
+        'results': results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:>26}: {result['median_ms']:10.2f} ms")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nHasil ditulis ke {args.output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Server HTTP lokal pengganti export CSV Google Sheets untuk benchmark.
+
+Menyajikan CSV sintetis yang sama untuk semua sheet ID (DPS/DGS), dengan ETag
+supaya jalur conditional request (304) ikut teruji.
+"""
+import hashlib
+import http.server
+import tempfile
+import threading
+from pathlib import Path
+
+from components import data_loader
+
+class SheetServer:
+    """
+    Server CSV di 127.0.0.1 (port acak), isi bisa diganti lewat set_content().
+    etag=False mensimulasikan server tanpa ETag (selalu 200 dengan body penuh).
+    """
+
+    def __init__(self, raw=b"", etag=True):
+        self.requests = 0
+        self.not_modified = 0
+        self.use_etag = etag
+        self.set_content(raw)
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = None
+
+    def set_content(self, raw):
+        """Ganti isi CSV (request berikutnya melihat ETag baru)"""
+        self.raw = raw
+        self.etag = '"%s"' % hashlib.sha256(raw).hexdigest()[:16]
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.use_etag and self.headers.get('If-None-Match') == server.etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/csv')
+                self.send_header('Content-Length', str(len(server.raw)))
+                if server.use_etag:
+                    self.send_header('ETag', server.etag)
+                self.end_headers()
+                self.wfile.write(server.raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @property
+    def url(self):
+        """Template URL export, format sama dengan data_loader.SHEET_EXPORT_URL"""
+        return f"http://127.0.0.1:{self._server.server_port}/{{sheet_id}}.csv"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="sheet-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def use_local_sheet(server, snapshot_dir=None):
+    """
+    Arahkan data_loader ke server lokal dan folder snapshot sementara.
+    Return folder snapshot yang dipakai.
+    """
+    snapshot_dir = Path(snapshot_dir or tempfile.mkdtemp(prefix="highfive-bench-"))
+    data_loader.SHEET_EXPORT_URL = server.url
+    data_loader.SNAPSHOT_DIR = snapshot_dir
+    return snapshot_dir
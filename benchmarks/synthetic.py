@@ -0,0 +1,69 @@
+"""
+Generator sheet High Five sintetis untuk benchmark.
+
+Kolom dan format sama dengan export CSV Google Sheets DPS/DGS, termasuk
+nilai persen yang "kotor" ('45%', ' 45 % ', '-', kosong, teks).
+"""
+import csv
+import io
+import random
+
+from components.sidebar import WITEL_LIST
+
+COLUMNS = [
+    'NO', 'WITEL', 'AM', 'NIK AM', 'CUSTOMER_NAME', 'PRODUCT', 'Kategori Product High Five',
+    'NILAI', '% Progress', '% Results', 'Progress', 'KETERANGAN', 'UPDATE TERAKHIR',
+]
+
+CATEGORIES = ['CONNECTIVITY', 'DIGITAL SOLUTION', 'IT SERVICES', 'CYBER SECURITY', 'SATELLITE']
+
+PROGRESS_STATUS = ['Visit', 'Proposal', 'Negosiasi', 'Kontrak', 'Win', 'Lose', '']
+
+def _messy_percent(rng):
+    """Nilai persen dengan variasi format seperti yang diketik user di sheet"""
+    value = rng.randint(0, 100)
+    return rng.choice([
+        f"{value}%", f"{value}%", f"{value}%", f" {value} % ", f"{value}", f"{value}.5%", "-", "", "n/a",
+    ])
+
+def generate_rows(rows=10000, witels=8, ams_per_witel=25, customers_per_am=8,
+                  products=40, categories=5, seed=42):
+    """Generate baris sheet sebagai list of list (urutan kolom = COLUMNS)"""
+    rng = random.Random(seed)
+    witel_names = (WITEL_LIST * (witels // len(WITEL_LIST) + 1))[:witels]
+    witel_names = [name if i < len(WITEL_LIST) else f"{name} {i}" for i, name in enumerate(witel_names)]
+    category_names = [CATEGORIES[i % len(CATEGORIES)] + ("" if i < len(CATEGORIES) else f" {i}")
+                      for i in range(categories)]
+    product_names = [(f"PRODUCT {i:03d}", category_names[i % categories]) for i in range(products)]
+
+    data = []
+    for i in range(rows):
+        witel = rng.choice(witel_names)
+        am_idx = rng.randrange(ams_per_witel)
+        product, category = rng.choice(product_names)
+        nilai = rng.choice([str(rng.randint(1, 5000) * 1_000_000), str(rng.randint(1, 500) * 100_000), ""])
+        data.append([
+            i + 1,
+            witel,
+            f"AM {witel[:4]}-{am_idx:03d}",
+            f"{900000 + am_idx}",
+            f"PT CUSTOMER {witel[:3]}-{am_idx:03d}-{rng.randrange(customers_per_am):02d}",
+            product,
+            category,
+            nilai,
+            _messy_percent(rng),
+            _messy_percent(rng),
+            rng.choice(PROGRESS_STATUS),
+            rng.choice(["", "follow up minggu depan", "menunggu PO", "on hold"]),
+            f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        ])
+    return data
+
+def generate_csv(rows=10000, **kwargs):
+    """Generate sheet sintetis sebagai bytes CSV (seperti body response export Google Sheets)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    # Header dengan spasi ekstra seperti di sheet asli
+    writer.writerow([f" {name}" if name == 'WITEL' else name for name in COLUMNS])
+    writer.writerows(generate_rows(rows, **kwargs))
+    return buf.getvalue().encode("utf-8")
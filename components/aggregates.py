@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMN = 'Kategori Product High Five'
+
+# Granularitas cube (per Dataset, jadi efektifnya source × WITEL × kategori × produk × AM × customer)
+CUBE_KEYS = ['WITEL', CATEGORY_COLUMN, 'PRODUCT', 'AM', 'CUSTOMER_NAME']
+
+def build_cube(frame, keys=CUBE_KEYS):
+    """
+    Bangun aggregate cube dari baris mentah dalam satu groupby (default di granularitas CUBE_KEYS).
+    Setiap baris cube menyimpan jumlah baris, total NILAI, serta sum/count % Results dan % Progress,
+    sehingga rata-rata di level mana pun bisa dihitung ulang dari cube tanpa menyentuh baris mentah.
+    Kolom first_row menyimpan posisi kemunculan pertama untuk menjaga urutan tampilan seperti data asli.
+    """
+    work = pd.DataFrame(index=frame.index)
+    for key in keys:
+        work[key] = frame[key] if key in frame.columns else pd.Categorical([np.nan] * len(frame))
+
+    work['first_row'] = np.arange(len(frame))
+    work['rows'] = 1
+    work['nilai_sum'] = frame['NILAI'].astype('float64') if 'NILAI' in frame.columns else np.nan
+
+    for col, name in (('% Results', 'results'), ('% Progress', 'progress')):
+        values = frame[col].astype('float64') if col in frame.columns else pd.Series(np.nan, index=frame.index)
+        work[f'{name}_sum'] = values
+        work[f'{name}_n'] = values.notna().astype('int64')
+
+    cube = work.groupby(keys, observed=True, dropna=False, sort=False).agg(
+        first_row=('first_row', 'min'),
+        rows=('rows', 'sum'),
+        nilai_sum=('nilai_sum', 'sum'),
+        results_sum=('results_sum', 'sum'),
+        results_n=('results_n', 'sum'),
+        progress_sum=('progress_sum', 'sum'),
+        progress_n=('progress_n', 'sum'),
+    )
+    return cube.reset_index().sort_values('first_row', ignore_index=True)
+
+def _ratio(total, count):
+    """total / count, NaN jika count 0 (sama dengan mean() pada data kosong)"""
+    return total / count if count > 0 else np.nan
+
+def summarize_categories(cube):
+    """
+    Win/Lose rate dan breakdown produk semua kategori dari cube (atau frame dengan kolom yang sama).
+    Return dict kategori -> {'win_rate', 'lose_rate', 'total_products', 'breakdown'}, urut sesuai kemunculan.
+    """
+    cube = cube[cube[CATEGORY_COLUMN].notna()]
+    sums = {'rows': 'sum', 'results_sum': 'sum', 'results_n': 'sum', 'first_row': 'min'}
+
+    by_category = cube.groupby(CATEGORY_COLUMN, observed=True, sort=False).agg(sums).sort_values('first_row')
+    by_product = (
+        cube[cube['PRODUCT'].notna()]
+        .groupby([CATEGORY_COLUMN, 'PRODUCT'], observed=True, sort=False)
+        .agg(sums)
+        .sort_values('first_row')
+    )
+
+    stats = {}
+    for row in by_category.itertuples():
+        if row.results_n > 0:
+            win_rate = row.results_sum / row.results_n
+            lose_rate, total_products = 100 - win_rate, int(row.rows)
+        else:
+            win_rate, lose_rate, total_products = 0, 100, 0
+
+        stats[row.Index] = {
+            'win_rate': win_rate,
+            'lose_rate': lose_rate,
+            'total_products': total_products,
+            'breakdown': {},
+        }
+
+    category_rows = by_category['rows']
+    for row in by_product.itertuples():
+        category, product_name = row.Index
+        stats[category]['breakdown'][product_name] = {
+            'count': int(row.rows),
+            'percentage': (row.rows / category_rows[category]) * 100,
+            'avg_result': _ratio(row.results_sum, row.results_n),
+        }
+
+    return stats
+
+def summarize_ams(cube):
+    """Agregat per AM (customer, produk, NILAI, rata-rata progress), urut Total_Nilai terbesar"""
+    cube = cube[cube['AM'].notna()]
+    grouped = cube.assign(
+        product_rows=cube['rows'].where(cube['PRODUCT'].notna(), 0)
+    ).groupby('AM', observed=True)
+
+    am_groups = pd.DataFrame({
+        'Total_Customers': grouped['CUSTOMER_NAME'].nunique(),
+        'Total_Products': grouped['product_rows'].sum(),
+        'Total_Nilai': grouped['nilai_sum'].sum(),
+        'Avg_Progress': grouped['progress_sum'].sum() / grouped['progress_n'].sum().replace(0, np.nan),
+    }).reset_index()
+
+    return am_groups.sort_values('Total_Nilai', ascending=False)
+
+def _witel_summary(cube, category_stats, am_groups):
+    """Dict ringkasan WITEL: total dari cube ditambah statistik kategori dan agregat AM"""
+    return {
+        'total_records': int(cube['rows'].sum()),
+        'avg_result': _ratio(cube['results_sum'].sum(), cube['results_n'].sum()),
+        'avg_progress': _ratio(cube['progress_sum'].sum(), cube['progress_n'].sum()),
+        'total_customers': cube['CUSTOMER_NAME'].nunique(),
+        'categories': list(category_stats),
+        'category_stats': category_stats,
+        'am_groups': am_groups,
+    }
+
+def summarize_witel(cube):
+    """Semua angka yang ditampilkan section pie chart dan Account Manager untuk satu WITEL"""
+    return _witel_summary(cube, summarize_categories(cube), summarize_ams(cube))
+
+def resummarize_witel(summary, cube, categories, ams):
+    """
+    Perbarui ringkasan WITEL lama setelah sebagian baris berubah: hanya kategori di categories
+    dan AM di ams yang dihitung ulang dari cube, sisanya dipakai dari summary lama.
+    ams None berarti semua AM dihitung ulang. Hasilnya sama dengan summarize_witel(cube).
+    """
+    # Urutan kategori = urutan kemunculan pertama (cube sudah urut first_row)
+    order = cube[CATEGORY_COLUMN].dropna().unique()
+    previous_stats = summary['category_stats']
+    changed = {category for category in order if category in categories or category not in previous_stats}
+    updated = summarize_categories(cube[cube[CATEGORY_COLUMN].isin(changed)]) if changed else {}
+    category_stats = {
+        category: updated[category] if category in changed else previous_stats[category]
+        for category in order
+    }
+
+    if ams is None:
+        am_groups = summarize_ams(cube)
+    else:
+        kept = summary['am_groups'][~summary['am_groups']['AM'].isin(ams)]
+        am_groups = pd.concat([kept, summarize_ams(cube[cube['AM'].isin(ams)])], ignore_index=True)
+        # Susun ulang ke urutan groupby AM lalu sort yang sama dengan summarize_ams (hasil tie identik)
+        am_groups['AM'] = am_groups['AM'].astype(cube['AM'].dtype)
+        am_groups = am_groups.sort_values('AM', kind='stable', ignore_index=True)
+        am_groups = am_groups.sort_values('Total_Nilai', ascending=False)
+
+    return _witel_summary(cube, category_stats, am_groups)
@@ -0,0 +1,312 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from pandas._libs.parsers import STR_NA_VALUES
+
+# Mapping DPS/DGS ke spreadsheet ID yang berbeda
+SHEET_CONFIGS = {
+    "DPS": "1K-596RSSwJWO1HiAwOBG2gnMSUtrEhvnKIdH8P4w8e4",
+    "DGS": "1QazP2uYyoPNZU8qfJuAevHFyJP0SmaSwYSc7JXTchCo",
+}
+
+# URL export CSV (bisa dioverride lewat env, misal untuk server lokal saat benchmark)
+SHEET_EXPORT_URL = os.environ.get(
+    "HIGHFIVE_EXPORT_URL",
+    "https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv",
+)
+
+# Lokasi snapshot Parquet lokal (bisa dioverride lewat env)
+SNAPSHOT_DIR = Path(os.environ.get("HIGHFIVE_SNAPSHOT_DIR", ".cache/snapshots"))
+
+# Timeout download sheet (detik)
+FETCH_TIMEOUT = 30
+
+# Umur maksimal snapshot sebelum sheet di-download ulang (detik)
+SNAPSHOT_MAX_AGE = 300
+
+# Schema ingest: hanya kolom yang dipakai dashboard yang dibaca.
+# Dimensi disimpan sebagai categorical, persentase float32.
+# NILAI tetap float64 karena nilai Rupiah (miliaran) melebihi presisi float32.
+INGEST_SCHEMA = {
+    'WITEL': 'category',
+    'AM': 'category',
+    'CUSTOMER_NAME': 'category',
+    'PRODUCT': 'category',
+    'Kategori Product High Five': 'category',
+    'Progress': 'category',
+    'NILAI': 'float64',
+    '% Progress': 'float32',
+    '% Results': 'float32',
+}
+
+# Mode parse CSV: "fast" (pyarrow) atau "pandas" (jalur lama, juga fallback jika fast gagal)
+PARSE_MODE = os.environ.get("HIGHFIVE_PARSE_MODE", "fast")
+
+# Angka yang diterima saat membersihkan kolom persen (setara dengan pd.to_numeric, termasuk inf/infinity)
+NUMERIC_PATTERN = r"^[+-]?((\d+(\.\d*)?|\.\d+)(e[+-]?\d+)?|inf(inity)?)$"
+
+# Token yang dibaca sebagai kosong oleh parser pyarrow: sama dengan default pandas.read_csv
+# (default pyarrow tidak mengenal 'None' dan '<NA>')
+NULL_VALUES = sorted(STR_NA_VALUES)
+
+# Naikkan setiap kali INGEST_SCHEMA / cleaning berubah supaya snapshot lama tidak dipakai
+SCHEMA_VERSION = 3
+
+logger = logging.getLogger(__name__)
+
+def get_csv_url(data_source):
+    """Dapatkan URL export CSV Google Sheets untuk DPS/DGS"""
+    sheet_id = SHEET_CONFIGS.get(data_source)
+    if sheet_id is None:
+        raise ValueError(f"Data source tidak dikenal: {data_source}")
+    return SHEET_EXPORT_URL.format(sheet_id=sheet_id)
+
+def clean_sheet(df):
+    """Bersihkan nama kolom dan konversi NILAI, % Results, % Progress ke numeric"""
+    # Clean column names
+    df.columns = df.columns.str.strip()
+
+    # Clean NILAI - convert to numeric
+    if 'NILAI' in df.columns:
+        df['NILAI'] = pd.to_numeric(df['NILAI'], errors='coerce')
+
+    # Clean % Results
+    if '% Results' in df.columns:
+        df['% Results'] = df['% Results'].astype(str).str.replace('%', '').str.strip()
+        df['% Results'] = pd.to_numeric(df['% Results'], errors='coerce')
+
+    # Clean % Progress
+    if '% Progress' in df.columns:
+        df['% Progress'] = df['% Progress'].astype(str).str.replace('%', '').str.strip()
+        df['% Progress'] = pd.to_numeric(df['% Progress'], errors='coerce')
+
+    return apply_schema(df)
+
+def apply_schema(df):
+    """Cast kolom ke tipe di INGEST_SCHEMA (kolom yang tidak ada dilewati)"""
+    for col, dtype in INGEST_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+        if dtype == 'category' and not df[col].cat.categories.is_monotonic_increasing:
+            # Urutan kategori alfabetis supaya sort_values sama dengan sort string biasa
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+def download_sheet(data_source, meta=None):
+    """
+    Download CSV mentah dengan conditional request (ETag/Last-Modified dari meta).
+    Return (raw_bytes, meta_baru). raw_bytes None jika sheet tidak berubah,
+    baik karena server menjawab 304 maupun karena digest isinya sama dengan download terakhir.
+    """
+    meta = meta or {}
+    request = urllib.request.Request(get_csv_url(data_source))
+    if meta.get('etag'):
+        request.add_header('If-None-Match', meta['etag'])
+    if meta.get('last_modified'):
+        request.add_header('If-Modified-Since', meta['last_modified'])
+
+    try:
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            raw = response.read()
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, dict(meta, fetched_at=time.time())
+        raise
+
+    new_meta = {
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'fetched_at': time.time(),
+    }
+
+    if new_meta['sha256'] == meta.get('sha256'):
+        return None, new_meta
+
+    return raw, new_meta
+
+def _ingest_columns(raw):
+    """Nama kolom asli di sheet yang masuk INGEST_SCHEMA (nama di sheet kadang ada spasi)"""
+    header = pd.read_csv(io.BytesIO(raw), nrows=0).columns
+    return [name for name in header if name.strip() in INGEST_SCHEMA]
+
+def parse_sheet_pandas(raw):
+    """Parse CSV mentah dengan engine pandas lalu bersihkan (jalur lama)"""
+    usecols = _ingest_columns(raw)
+    dtype = {name: 'category' for name in usecols if INGEST_SCHEMA[name.strip()] == 'category'}
+
+    df = pd.read_csv(io.BytesIO(raw), usecols=usecols, dtype=dtype)
+    return clean_sheet(df)
+
+def _parse_percent(column):
+    """Bersihkan kolom persen ('45 %', '45%') langsung di Arrow, nilai non-angka jadi null"""
+    cleaned = pc.utf8_trim_whitespace(pc.replace_substring(column, '%', ''))
+    is_number = pc.match_substring_regex(cleaned, NUMERIC_PATTERN, ignore_case=True)
+    return pc.cast(pc.if_else(is_number, cleaned, None), pa.float32())
+
+def parse_sheet_fast(raw):
+    """
+    Parse CSV mentah dengan pyarrow: multi-thread, dimensi langsung jadi dictionary (categorical),
+    NILAI diparse sebagai float saat read, dan kolom persen dibersihkan dengan kernel Arrow.
+    Melempar pa.ArrowInvalid jika isi sheet tidak cocok (misal NILAI berisi teks).
+    """
+    usecols = _ingest_columns(raw)
+    column_types = {}
+    for name in usecols:
+        dtype = INGEST_SCHEMA[name.strip()]
+        if dtype == 'category':
+            column_types[name] = pa.dictionary(pa.int32(), pa.string())
+        elif name.strip() == 'NILAI':
+            column_types[name] = pa.float64()
+        else:
+            column_types[name] = pa.string()
+
+    table = pacsv.read_csv(
+        io.BytesIO(raw),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=usecols,
+            column_types=column_types,
+            null_values=NULL_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+    columns = {}
+    for name in usecols:
+        column = table.column(name)
+        if name.strip() in ('% Results', '% Progress'):
+            column = _parse_percent(column)
+        columns[name.strip()] = column.to_pandas()
+
+    return apply_schema(pd.DataFrame(columns))
+
+def parse_sheet(raw):
+    """Parse CSV mentah sesuai PARSE_MODE; jalur fast jatuh ke jalur pandas jika gagal"""
+    if PARSE_MODE == "fast":
+        try:
+            return parse_sheet_fast(raw)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            logger.info("Parse pyarrow gagal, pakai parser pandas", exc_info=True)
+    return parse_sheet_pandas(raw)
+
+def fetch_sheet(data_source):
+    """Download dan parse CSV dari Google Sheets (tanpa conditional request)"""
+    raw, _ = download_sheet(data_source)
+    return parse_sheet(raw)
+
+def snapshot_path(data_source):
+    """Path file snapshot Parquet untuk DPS/DGS"""
+    return SNAPSHOT_DIR / f"{data_source}.v{SCHEMA_VERSION}.parquet"
+
+def meta_path(data_source):
+    """Path file metadata download (ETag, Last-Modified, digest) untuk DPS/DGS"""
+    return SNAPSHOT_DIR / f"{data_source}.v{SCHEMA_VERSION}.json"
+
+def read_meta(data_source):
+    """Baca metadata download terakhir, dict kosong jika belum ada"""
+    try:
+        return json.loads(meta_path(data_source).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def write_meta(data_source, meta):
+    """Simpan metadata download terakhir"""
+    path = meta_path(data_source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(meta))
+    os.replace(tmp_path, path)
+
+def write_snapshot(data_source, df):
+    """
+    Simpan frame hasil cleaning sebagai Parquet.
+    Ditulis ke file sementara lalu di-rename supaya pembaca tidak pernah melihat file setengah jadi.
+    """
+    path = snapshot_path(data_source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Kolom object campuran (angka + teks) tidak bisa ditulis Arrow, samakan jadi teks
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype == object:
+            out[col] = out[col].where(out[col].isna(), out[col].astype(str))
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    out.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def read_snapshot(data_source, max_age=SNAPSHOT_MAX_AGE):
+    """
+    Baca snapshot Parquet jika ada dan umurnya belum lewat max_age detik.
+    Return None jika snapshot tidak ada atau sudah kadaluarsa.
+    """
+    path = snapshot_path(data_source)
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    if max_age is not None and age > max_age:
+        return None
+
+    return pd.read_parquet(path)
+
+def clear_snapshots():
+    """Hapus semua snapshot supaya load berikutnya download ulang dari Google Sheets"""
+    for data_source in SHEET_CONFIGS:
+        snapshot_path(data_source).unlink(missing_ok=True)
+        meta_path(data_source).unlink(missing_ok=True)
+
+def load_sheet(data_source, max_age=SNAPSHOT_MAX_AGE, force=False):
+    """
+    Load data DPS/DGS: pakai snapshot lokal jika masih segar.
+    Kalau sudah kadaluarsa, cek ke Google Sheets dengan conditional request;
+    jika isi sheet tidak berubah, snapshot lama dipakai lagi tanpa parse dan cleaning ulang.
+    force=True: selalu download penuh dan parse ulang (tanpa header conditional);
+    snapshot lama tetap ada sampai berhasil diganti.
+    Return (df, meta): meta milik isi df (sha256 = versi data), bukan isi file meta di disk,
+    yang bisa tertinggal jika penulisan snapshot gagal.
+    """
+    if not force:
+        df = read_snapshot(data_source, max_age=max_age)
+        if df is not None:
+            return df, read_meta(data_source)
+
+    has_snapshot = not force and snapshot_path(data_source).exists()
+    raw, meta = download_sheet(data_source, read_meta(data_source) if has_snapshot else None)
+
+    if raw is None:
+        # Sheet tidak berubah: perpanjang umur snapshot lalu pakai lagi
+        try:
+            os.utime(snapshot_path(data_source))
+            df = read_snapshot(data_source, max_age=None)
+        except FileNotFoundError:
+            df = None
+        if df is not None:
+            write_meta(data_source, meta)
+            return df, meta
+        # Snapshot hilang di tengah jalan (misal tombol refresh), download penuh
+        raw, meta = download_sheet(data_source)
+
+    df = parse_sheet(raw)
+    try:
+        write_snapshot(data_source, df)
+        write_meta(data_source, meta)
+    except Exception:
+        # Snapshot hanya optimasi, kegagalan tulis tidak boleh menggagalkan load
+        logger.warning("Gagal menyimpan snapshot %s", data_source, exc_info=True)
+    return df, meta
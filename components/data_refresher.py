@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from components.data_loader import SHEET_CONFIGS, SNAPSHOT_MAX_AGE, load_sheet, read_meta, read_snapshot
+from components.dataset import Dataset
+
+# Interval refresh background (detik), samakan dengan umur snapshot
+REFRESH_INTERVAL = SNAPSHOT_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+class SheetRefresher:
+    """
+    Penyimpan Dataset terakhir yang valid per DPS/DGS, dipakai bersama oleh semua session.
+    Thread background me-refresh semua sheet secara berkala dan mengganti Dataset secara atomik,
+    jadi request user tidak pernah menunggu network kecuali saat belum ada data sama sekali.
+    """
+
+    def __init__(self, interval=REFRESH_INTERVAL):
+        self.interval = interval
+        self._datasets = {}
+        self._errors = {}
+        self._locks = {data_source: threading.Lock() for data_source in SHEET_CONFIGS}
+        self._wake = threading.Event()
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=len(SHEET_CONFIGS), thread_name_prefix="highfive-loader")
+        self.timings = {}
+
+    def start(self):
+        """Jalankan thread refresh background (sekali per proses)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="highfive-refresher", daemon=True)
+            self._thread.start()
+
+    def warm_up(self):
+        """
+        Mulai load semua sheet secara paralel tanpa menunggu hasilnya.
+        Request yang datang selama warm-up menunggu sheet-nya saja, bukan semua sheet.
+        """
+        return [self._pool.submit(self._get_safely, data_source) for data_source in SHEET_CONFIGS]
+
+    def get(self, data_source):
+        """
+        Ambil Dataset terakhir yang valid.
+        Jika belum ada di memori, pakai snapshot lokal walaupun sudah kadaluarsa lalu minta revalidasi;
+        hanya jika snapshot juga tidak ada, download dilakukan langsung (blocking).
+        """
+        dataset = self._datasets.get(data_source)
+        if dataset is not None:
+            return dataset
+
+        with self._locks[data_source]:
+            dataset = self._datasets.get(data_source)
+            if dataset is not None:
+                return dataset
+
+            started = time.perf_counter()
+            df = read_snapshot(data_source, max_age=None)
+            if df is not None:
+                dataset = self._swap(data_source, df, read_meta(data_source).get('sha256'))
+                self._record_timing(data_source, 'snapshot', started, dataset)
+                self._wake.set()
+            else:
+                dataset = self._refresh(data_source, max_age=SNAPSHOT_MAX_AGE)
+
+            # Error warm-up sebelumnya tidak berlaku lagi setelah data berhasil dimuat
+            self._errors.pop(data_source, None)
+            return dataset
+
+    def refresh_all(self, force=False):
+        """
+        Refresh semua sheet sekarang juga; force=True download penuh tanpa header conditional.
+        Snapshot tidak dihapus, jadi refresh yang gagal tetap menyisakan data terakhir yang valid.
+        """
+        self._refresh_concurrently(max_age=0, force=force)
+
+    def last_error(self, data_source):
+        """Error refresh terakhir (None jika refresh terakhir sukses)"""
+        return self._errors.get(data_source)
+
+    def _get_safely(self, data_source):
+        """get() untuk warm-up: error dicatat, tidak dilempar ke thread pool"""
+        try:
+            self.get(data_source)
+        except Exception as e:
+            self._errors[data_source] = e
+            logger.warning("Warm-up %s gagal", data_source, exc_info=True)
+
+    def _refresh_concurrently(self, max_age, force=False):
+        """Refresh semua sheet secara paralel dan tunggu sampai semuanya selesai"""
+        futures = [
+            self._pool.submit(self._refresh_safely, data_source, max_age, force)
+            for data_source in SHEET_CONFIGS
+        ]
+        for future in futures:
+            future.result()
+
+    def _record_timing(self, data_source, kind, started, dataset):
+        """Catat durasi load terakhir per sheet"""
+        timing = {
+            'source': data_source,
+            'kind': kind,
+            'seconds': round(time.perf_counter() - started, 4),
+            'rows': len(dataset.frame),
+            'finished_at': time.time(),
+        }
+        self.timings[data_source] = timing
+        logger.info("Load %(source)s (%(kind)s): %(seconds).3fs, %(rows)d baris", timing)
+
+    def _refresh(self, data_source, max_age, force=False):
+        """Load sheet lalu swap Dataset; Dataset lama dipertahankan jika isi sheet tidak berubah"""
+        started = time.perf_counter()
+        df, meta = load_sheet(data_source, max_age=max_age, force=force)
+        version = meta.get('sha256')
+
+        current = self._datasets.get(data_source)
+        if current is not None and version is not None and version == current.version:
+            self._record_timing(data_source, 'unchanged', started, current)
+            return current
+
+        dataset = self._swap(data_source, df, version)
+        self._record_timing(data_source, 'refresh' if dataset.delta is None else 'delta', started, dataset)
+        if dataset.delta is not None:
+            delta = dataset.delta
+            logger.info(
+                "Delta %s: +%d -%d ~%d baris, %d WITEL / %d kategori / %d AM dihitung ulang",
+                data_source, delta['added'], delta['removed'], delta['modified'],
+                len(delta['witels']), len(delta['categories']), len(delta['ams']),
+            )
+        return dataset
+
+    def _refresh_safely(self, data_source, max_age, force=False):
+        """Refresh tanpa melempar error; frame lama tetap dipakai dan error dicatat"""
+        try:
+            with self._locks[data_source]:
+                self._refresh(data_source, max_age=max_age, force=force)
+            self._errors.pop(data_source, None)
+        except Exception as e:
+            self._errors[data_source] = e
+            logger.warning("Refresh %s gagal", data_source, exc_info=True)
+
+    def _swap(self, data_source, df, version):
+        """
+        Bangun Dataset (partisi WITEL dll) sekali untuk versi ini, lalu ganti secara atomik
+        (satu assignment dict, pembaca melihat Dataset lama atau baru).
+        Jika sudah ada Dataset sebelumnya, hanya WITEL/kategori/AM yang barisnya berubah yang dihitung ulang.
+        """
+        dataset = Dataset(data_source, df, version, previous=self._datasets.get(data_source))
+        self._datasets[data_source] = dataset
+        return dataset
+
+    def _run(self):
+        """Loop background: refresh tiap interval, atau lebih cepat jika dibangunkan"""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._refresh_concurrently(max_age=self.interval)
+
+@st.cache_resource
+def get_refresher():
+    """
+    Refresher tunggal per proses server (shared oleh semua session).
+    Dibuat pada script run pertama setelah server start, dan langsung warm-up semua sheet.
+    """
+    refresher = SheetRefresher()
+    refresher.warm_up()
+    refresher.start()
+    return refresher
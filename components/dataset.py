@@ -0,0 +1,231 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from components.aggregates import CATEGORY_COLUMN, build_cube, resummarize_witel, summarize_witel
+
+# Identitas baris yang stabil antar versi sheet (dipakai untuk deteksi baris tambah/hapus/ubah)
+ROW_KEY = ['WITEL', 'AM', 'CUSTOMER_NAME', 'PRODUCT']
+
+def sort_positions(frame, columns, ascending=True):
+    """Posisi baris (iloc) frame setelah diurutkan menurut columns; NaN di akhir"""
+    ordered = frame[list(columns)].reset_index(drop=True).sort_values(
+        list(columns), ascending=ascending, kind='stable', na_position='last'
+    )
+    return ordered.index.to_numpy()
+
+def row_hashes(frame, columns=None):
+    """Hash 64-bit per baris (semua kolom atau columns), tidak bergantung pada index"""
+    return pd.util.hash_pandas_object(frame if columns is None else frame[columns], index=False).to_numpy()
+
+def _group_hashes(frame, hashes, keys):
+    """Urutan hash baris per grup keys: {grup: array hash}"""
+    return {
+        group: hashes[positions]
+        for group, positions in frame.groupby(keys, observed=True, sort=False).indices.items()
+    }
+
+def changed_groups(old, new, old_hashes, new_hashes, keys):
+    """Grup keys yang isi atau urutan barisnya berbeda antara frame lama dan baru (termasuk grup baru/hilang)"""
+    before = _group_hashes(old, old_hashes, keys)
+    after = _group_hashes(new, new_hashes, keys)
+    return {
+        group for group in before.keys() | after.keys()
+        if group not in before or group not in after or not np.array_equal(before[group], after[group])
+    }
+
+def _occurrence_ids(hashes):
+    """Hash baris + urutan kemunculannya, supaya baris kembar tetap terhitung satu per satu"""
+    if not pd.Index(hashes).has_duplicates:
+        return hashes
+    occurrence = pd.Series(hashes).groupby(hashes, sort=False).cumcount().to_numpy(dtype=np.uint64)
+    return hashes + occurrence * np.uint64(0x9E3779B97F4A7C15)
+
+def keyed_delta(old, new, old_hashes, new_hashes, key=ROW_KEY):
+    """
+    Baris yang tidak punya kembaran identik di versi lain dipasangkan lewat identitas key:
+    key ada di kedua sisi = baris diubah, hanya di versi baru = ditambah, hanya di versi lama = dihapus.
+    Return (jumlah baris tambah, hapus, ubah, set (WITEL, AM) yang barisnya berubah).
+    """
+    old_ids, new_ids = _occurrence_ids(old_hashes), _occurrence_ids(new_hashes)
+
+    def key_rows(frame, positions):
+        # Sisa baris biasanya sedikit, cukup tuple Python (NaN diganti None supaya sama dengan dirinya)
+        columns = [frame[col].iloc[positions].tolist() for col in key]
+        return [tuple(None if value != value else value for value in row) for row in zip(*columns)]
+
+    old_keys = key_rows(old, np.flatnonzero(~pd.Index(old_ids).isin(new_ids)))
+    new_keys = key_rows(new, np.flatnonzero(~pd.Index(new_ids).isin(old_ids)))
+    modified = sum((Counter(old_keys) & Counter(new_keys)).values())
+
+    witel_at, am_at = key.index('WITEL'), key.index('AM')
+    ams = {
+        (row[witel_at], row[am_at]) for row in old_keys + new_keys
+        if row[witel_at] is not None and row[am_at] is not None
+    }
+    return len(new_keys) - modified, len(old_keys) - modified, modified, ams
+
+def diff_frames(old, new, old_hashes, new_hashes):
+    """
+    Delta antara dua versi frame: WITEL dan (WITEL, kategori) yang isi/urutan barisnya berubah,
+    (WITEL, AM) yang barisnya berubah, serta jumlah baris tambah/hapus/ubah menurut ROW_KEY.
+    Return None jika kolom berbeda (tidak bisa dibandingkan, Dataset dibangun penuh).
+    """
+    required = ROW_KEY + [CATEGORY_COLUMN]
+    if list(old.columns) != list(new.columns) or any(col not in new.columns for col in required):
+        return None
+
+    witels = changed_groups(old, new, old_hashes, new_hashes, 'WITEL')
+
+    # Kategori hanya bisa berubah di WITEL yang berubah
+    old_mask = old['WITEL'].isin(witels).to_numpy()
+    new_mask = new['WITEL'].isin(witels).to_numpy()
+    categories = changed_groups(
+        old[old_mask], new[new_mask], old_hashes[old_mask], new_hashes[new_mask], ['WITEL', CATEGORY_COLUMN]
+    )
+    added, removed, modified, ams = keyed_delta(old, new, old_hashes, new_hashes)
+    return {
+        'witels': witels,
+        'categories': categories,
+        'ams': ams,
+        'added': added,
+        'removed': removed,
+        'modified': modified,
+    }
+
+class Dataset:
+    """
+    Satu versi data DPS/DGS beserta struktur turunannya, dibangun sekali per versi data.
+    Dipakai bersama oleh semua session, jadi frame dan partisinya harus diperlakukan read-only.
+
+    Jika previous (Dataset versi sebelumnya dari sumber yang sama) diberikan, hanya WITEL yang barisnya
+    berubah yang dihitung ulang; cube, ringkasan, urutan sort dan revisi WITEL lain dibawa dari previous.
+    """
+
+    def __init__(self, data_source, frame, version=None, previous=None):
+        self.data_source = data_source
+        self.frame = frame
+        self.version = version
+        self._partitions = self._build_partitions(frame)
+        self._empty = frame.iloc[0:0]
+        self._hashes = None
+        self._summaries = {}
+        self._sort_orders = {}
+        # Revisi per (WITEL,) dan (WITEL, kategori): versi data terakhir yang mengubah barisnya
+        self._revisions = {}
+        # Ringkasan lama WITEL yang berubah: (summary, kategori berubah, AM berubah), dipakai saat summary() pertama
+        self._stale = {}
+
+        self.delta = None
+        if previous is not None and previous.data_source == data_source:
+            self.delta = diff_frames(previous.frame, frame, previous.row_hashes(), self.row_hashes())
+
+        if self.delta is None:
+            # Aggregate cube sekali per versi data; ringkasan per WITEL dihitung dari cube saat pertama diminta
+            cube = build_cube(frame)
+            self._cube_partitions = self._build_partitions(cube)
+            self._empty_cube = cube.iloc[0:0]
+        else:
+            self._carry_over(previous, self.delta)
+
+    def _carry_over(self, previous, delta):
+        """
+        Bangun cube hanya untuk WITEL yang berubah; WITEL lain memakai cube, ringkasan,
+        urutan sort dan revisi dari previous (isi dan urutan barisnya identik).
+        """
+        changed = delta['witels']
+        self._cube_partitions = {}
+        self._empty_cube = previous._empty_cube
+        if changed:
+            positions = np.flatnonzero(self.frame['WITEL'].isin(changed).to_numpy())
+            cube = build_cube(self.frame.iloc[positions])
+            # first_row relatif ke subset, kembalikan ke posisi di frame penuh
+            cube['first_row'] = positions[cube['first_row'].to_numpy()]
+            self._cube_partitions = self._build_partitions(cube)
+
+        for witel, witel_cube in previous._cube_partitions.items():
+            if witel not in changed:
+                self._cube_partitions[witel] = witel_cube
+
+        for witel, witel_cube in previous._cube_partitions.items():
+            for category in witel_cube[CATEGORY_COLUMN].dropna().unique():
+                if (witel, category) not in delta['categories']:
+                    self._revisions[(witel, category)] = previous.revision(witel, category)
+            if witel not in changed:
+                self._revisions[(witel,)] = previous.revision(witel)
+
+        # Session lain bisa menambah ringkasan/urutan sort ke previous selama delta dibangun:
+        # iterasi salinan supaya tidak "dictionary changed size during iteration"
+        for witel, summary in list(previous._summaries.items()):
+            if witel not in changed:
+                self._summaries[witel] = summary
+            else:
+                categories = {category for group_witel, category in delta['categories'] if group_witel == witel}
+                ams = {am for group_witel, am in delta['ams'] if group_witel == witel}
+                self._stale[witel] = (summary, categories, ams)
+
+        for key, order in list(previous._sort_orders.items()):
+            if key[0] not in changed:
+                self._sort_orders[key] = order
+
+    @staticmethod
+    def _build_partitions(frame):
+        """Pecah frame per WITEL sekali saja (satu pass groupby, bukan scan per WITEL)"""
+        if 'WITEL' not in frame.columns:
+            return {}
+        return {
+            witel: partition
+            for witel, partition in frame.groupby('WITEL', observed=True, sort=False)
+        }
+
+    def row_hashes(self):
+        """Hash per baris frame (dihitung sekali, dipakai untuk delta ke versi berikutnya)"""
+        if self._hashes is None:
+            self._hashes = row_hashes(self.frame)
+        return self._hashes
+
+    def revision(self, witel, category=None):
+        """
+        Versi data terakhir yang mengubah baris WITEL (atau kategori di WITEL itu).
+        Dipakai sebagai key cache figure supaya WITEL/kategori yang tidak berubah tetap hit setelah refresh.
+        """
+        key = (witel,) if category is None else (witel, category)
+        return self._revisions.get(key, self.version)
+
+    def summary(self, witel):
+        """
+        Ringkasan WITEL (win rate kategori, breakdown produk, agregat AM) dari cube, di-memo per versi data.
+        Biaya rerun tidak lagi bergantung pada jumlah baris sheet.
+        Untuk WITEL yang berubah sejak versi sebelumnya, hanya kategori dan AM yang berubah dihitung ulang.
+        """
+        summary = self._summaries.get(witel)
+        if summary is None:
+            cube = self._cube_partitions.get(witel, self._empty_cube)
+            stale = self._stale.pop(witel, None)
+            if stale is not None:
+                summary = resummarize_witel(stale[0], cube, stale[1], stale[2])
+            else:
+                summary = summarize_witel(cube)
+            self._summaries[witel] = summary
+        return summary
+
+    def sort_order(self, witel, columns, ascending=True):
+        """
+        Urutan baris partisi WITEL (posisi iloc) menurut columns, di-memo per versi data.
+        Ganti halaman atau ganti kolom sort yang sudah pernah dipakai tidak mengurutkan ulang frame.
+        """
+        key = (witel, tuple(columns), ascending)
+        order = self._sort_orders.get(key)
+        if order is None:
+            order = self._sort_orders[key] = sort_positions(self.for_witel(witel), columns, ascending)
+        return order
+
+    def for_witel(self, witel):
+        """Sub-frame satu WITEL (lookup O(1), tanpa filter dan copy); frame kosong jika tidak ada data"""
+        return self._partitions.get(witel, self._empty)
+
+    @property
+    def witels(self):
+        """WITEL yang punya data di versi ini"""
+        return list(self._partitions)
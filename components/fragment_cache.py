@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# Jumlah maksimal fragmen HTML yang disimpan (kira-kira 1 KB per fragmen)
+FRAGMENT_CACHE_SIZE = 20000
+
+def fragment_key(kind, values):
+    """
+    Key cache dari field yang ditampilkan fragmen.
+    NaN diganti None karena NaN tidak sama dengan dirinya sendiri (key NaN tidak akan pernah hit).
+    """
+    return (kind,) + tuple(None if value != value else value for value in values)
+
+class FragmentCache:
+    """
+    Cache LRU berukuran tetap untuk fragmen HTML kartu (customer/produk), shared oleh semua session.
+    Fragmen yang field tampilannya tidak berubah dipakai ulang antar rerun dan antar session.
+    Counter hits/misses dihitung per proses; thread_stats() menghitung per thread (satu script run
+    berjalan di satu thread), jadi angka per rerun tidak tercampur dengan session lain.
+    """
+
+    def __init__(self, maxsize=FRAGMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(self, key, build, *args):
+        """Ambil fragmen untuk key; jika belum ada, bangun dengan build(*args) lalu simpan"""
+        with self._lock:
+            html = self._fragments.get(key)
+            if html is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                self._local.hits = getattr(self._local, 'hits', 0) + 1
+                return html
+            self.misses += 1
+        self._local.misses = getattr(self._local, 'misses', 0) + 1
+
+        html = build(*args)
+
+        with self._lock:
+            self._fragments[key] = html
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.maxsize:
+                self._fragments.popitem(last=False)
+        return html
+
+    def stats(self):
+        """Counter hit/miss dan jumlah fragmen tersimpan"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._fragments), 'maxsize': self.maxsize}
+
+    def thread_stats(self):
+        """Counter hit/miss milik thread ini saja (kumulatif, ambil selisihnya per rerun)"""
+        return {'hits': getattr(self._local, 'hits', 0), 'misses': getattr(self._local, 'misses', 0)}
+
+    def clear(self):
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._fragments.clear()
+            self.hits = self.misses = 0
+
+@st.cache_resource
+def get_fragment_cache():
+    """Cache fragmen tunggal per proses server (bertahan antar rerun dan session)"""
+    return FragmentCache()
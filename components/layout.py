@@ -278,5 +278,260 @@ def apply_custom_css():
             border-radius: 0 0 12px 12px !important;
             background: white !important;
         }
+        
+        /* ===== STAT CARDS (summary pie chart & account manager) ===== */
+        .hf-stat-card {
+            --stat-rgb: 234, 29, 37;
+            --stat-alpha: 0.25;
+            padding: 24px; border-radius: 18px;
+            box-shadow: 0 8px 24px rgba(var(--stat-rgb), var(--stat-alpha));
+            text-align: center; border: 2px solid rgba(255,255,255,0.1);
+            position: relative; overflow: hidden;
+        }
+        
+        .hf-stat-card::before {
+            content: '';
+            position: absolute; top: -30px; right: -30px;
+            width: 120px; height: 120px; background: rgba(255,255,255,0.08);
+            border-radius: 50%;
+        }
+        
+        .hf-stat-body {
+            position: relative; z-index: 1;
+        }
+        
+        .hf-stat-label {
+            color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700;
+            text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;
+        }
+        
+        .hf-stat-value {
+            color: white; font-size: 2.5rem; font-weight: 900; text-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        
+        .hf-stat-card--lg { --stat-alpha: 0.3; }
+        .hf-stat-card--lg .hf-stat-value { font-size: 2.75rem; text-shadow: 0 2px 8px rgba(0,0,0,0.2); }
+        
+        .hf-stat-red { background: linear-gradient(135deg, #ea1d25 0%, #d61921 100%); }
+        .hf-stat-card--lg.hf-stat-red { background: linear-gradient(135deg, #ea1d25 0%, #c41e24 100%); }
+        .hf-stat-blue { --stat-rgb: 59, 130, 246; background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%); }
+        .hf-stat-purple { --stat-rgb: 139, 92, 246; background: linear-gradient(135deg, #8b5cf6 0%, #7c3aed 100%); }
+        .hf-stat-green { --stat-rgb: 16, 185, 129; background: linear-gradient(135deg, #10b981 0%, #047857 100%); }
+        
+        /* ===== PIE CHART CATEGORY ===== */
+        .hf-category-head {
+            text-align: center; margin-bottom: 8px;
+        }
+        
+        .hf-category-head h3 {
+            color: #1a202c; margin: 0 0 12px 0; font-size: 1.375rem;
+            font-weight: 900; letter-spacing: -0.02em;
+        }
+        
+        .hf-category-count {
+            background: linear-gradient(135deg, #f5f5f5 0%, #e5e7eb 100%);
+            padding: 6px 14px; border-radius: 20px; display: inline-block;
+            color: #4a5568; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.5px;
+        }
+        
+        .hf-rate-box {
+            text-align: center; padding: 12px; border-radius: 12px;
+        }
+        
+        .hf-rate-box .hf-rate-value {
+            font-size: 1.25rem; font-weight: 800;
+        }
+        
+        .hf-rate-box .hf-rate-label {
+            font-size: 0.65rem; font-weight: 700;
+            text-transform: uppercase; letter-spacing: 0.05em; margin-top: 4px;
+        }
+        
+        .hf-rate-progress {
+            background: linear-gradient(135deg, rgba(234, 29, 37, 0.1) 0%, rgba(234, 29, 37, 0.05) 100%);
+            border: 2px solid rgba(234, 29, 37, 0.2);
+        }
+        .hf-rate-progress .hf-rate-value { color: #ea1d25; }
+        .hf-rate-progress .hf-rate-label { color: #6b7280; }
+        
+        .hf-rate-remaining {
+            background: linear-gradient(135deg, #f5f5f5 0%, #e5e7eb 100%);
+            border: 2px solid #d1d5db;
+        }
+        .hf-rate-remaining .hf-rate-value { color: #4a5568; }
+        .hf-rate-remaining .hf-rate-label { color: #9ca3af; }
+        
+        /* ===== DONUT SVG (renderer ringan) ===== */
+        .hf-donut {
+            position: relative; height: 240px;
+            display: flex; align-items: center; justify-content: center;
+        }
+        
+        .hf-donut svg {
+            height: 230px; width: 230px;
+        }
+        
+        .hf-donut circle {
+            transition: stroke-width 0.15s ease;
+        }
+        
+        .hf-donut circle:hover {
+            stroke-width: 19;
+        }
+        
+        .hf-donut-center {
+            position: absolute; inset: 0; pointer-events: none;
+            display: flex; flex-direction: column; align-items: center; justify-content: center;
+        }
+        
+        .hf-donut-center b {
+            font-size: 32px; color: #ea1d25; font-weight: 800; line-height: 1.1;
+        }
+        
+        .hf-donut-center small {
+            font-size: 10px; color: #6b7280; font-weight: 600; letter-spacing: 0.5px;
+        }
+        
+        .hf-donut-tip {
+            display: none; position: absolute; top: 8px; left: 50%; transform: translateX(-50%);
+            z-index: 10; min-width: 220px; max-width: 320px; pointer-events: none;
+            background: white; border: 1px solid #e5e7eb; border-radius: 8px;
+            box-shadow: 0 8px 24px rgba(0,0,0,0.12); padding: 10px 12px;
+            font-family: 'Inter', sans-serif; font-size: 13px; color: #1a202c; text-align: left;
+        }
+        
+        .hf-donut-tip b { display: block; font-size: 15px; }
+        .hf-donut-tip span { display: block; font-size: 18px; font-weight: 700; margin-bottom: 8px; }
+        .hf-donut-tip small { display: block; font-weight: 700; }
+        .hf-donut-tip ul { margin: 0; padding-left: 16px; }
+        .hf-donut-tip li { margin: 0; font-size: 12px; }
+        
+        .hf-donut:has(.hf-donut-progress:hover) .hf-donut-tip-progress,
+        .hf-donut:has(.hf-donut-remaining:hover) .hf-donut-tip-remaining {
+            display: block;
+        }
+        
+        /* ===== CARD MODE (AM / CUSTOMER / PRODUK) ===== */
+        .hf-tone-green { --tone: #10b981; --tone-shadow: #10b98130; }
+        .hf-tone-amber { --tone: #f59e0b; --tone-shadow: #f59e0b30; }
+        .hf-tone-blue { --tone: #3b82f6; --tone-shadow: #3b82f630; }
+        .hf-tone-red { --tone: #ef4444; --tone-shadow: #ef444430; }
+        .hf-tone-gray { --tone: #9ca3af; --tone-shadow: #9ca3af30; }
+        
+        .hf-am-summary {
+            display: flex; gap: 16px;
+        }
+        
+        .hf-am-summary > div {
+            flex: 1;
+        }
+        
+        .hf-am-bar {
+            background: #ea1d25; height: 8px; border-radius: 4px; margin-bottom: 12px;
+        }
+        
+        .hf-am-total {
+            color: #4a5568; font-size: 0.875rem; font-weight: 500;
+        }
+        
+        .hf-am-total span {
+            color: #ea1d25; font-weight: 800; font-size: 1.125rem;
+        }
+        
+        .hf-am-status {
+            text-align: right; padding-top: 16px;
+        }
+        
+        .hf-badge {
+            background: var(--tone); color: white;
+            padding: 6px 16px; border-radius: 16px; font-size: 0.8125rem;
+            font-weight: 700; display: inline-block;
+            box-shadow: 0 2px 8px var(--tone-shadow);
+        }
+        
+        .hf-customer {
+            background: #ffffff; border-left: 5px solid #ea1d25;
+            padding: 16px 20px; margin-bottom: 10px; margin-top: 24px; border-radius: 10px;
+            box-shadow: 0 2px 6px rgba(0,0,0,0.08); border: 1px solid #e5e7eb;
+            display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 12px;
+        }
+        
+        .hf-customer-info {
+            flex: 1; min-width: 200px;
+        }
+        
+        .hf-customer-name {
+            color: #1a202c; font-weight: 800; font-size: 1.125rem; margin-bottom: 4px;
+        }
+        
+        .hf-customer-count {
+            color: #9ca3af; font-size: 0.8125rem; font-weight: 600;
+        }
+        
+        .hf-customer-nilai {
+            text-align: right; color: #ea1d25; font-weight: 900; font-size: 1.25rem;
+        }
+        
+        .hf-product {
+            background: #f9fafb; padding: 14px 16px; margin-bottom: 8px;
+            border-radius: 8px; border: 1px solid #e5e7eb; border-left: 4px solid var(--tone);
+        }
+        
+        .hf-product-grid {
+            display: grid; grid-template-columns: 2fr 1fr 1fr 1fr; gap: 16px; align-items: center;
+        }
+        
+        .hf-product-name {
+            color: #1a202c; font-weight: 700; font-size: 0.9375rem; margin-bottom: 4px;
+        }
+        
+        .hf-product-nilai {
+            color: #6b7280; font-size: 0.75rem; font-weight: 500;
+        }
+        
+        .hf-metric {
+            text-align: center;
+        }
+        
+        .hf-metric b {
+            display: block; color: #4a5568; font-weight: 800; font-size: 1.0625rem;
+        }
+        
+        .hf-metric .hf-progress-value {
+            color: var(--tone);
+        }
+        
+        .hf-metric small {
+            display: block; color: #9ca3af; font-size: 0.6875rem; font-weight: 600;
+            text-transform: uppercase; letter-spacing: 0.05em;
+        }
+        
+        .hf-status-chip {
+            background: #e5e7eb; color: #4a5568; padding: 4px 10px;
+            border-radius: 6px; font-size: 0.75rem; font-weight: 700; display: inline-block;
+        }
+        
+        .hf-progress-track {
+            margin-top: 12px; background: #e5e7eb; height: 6px; border-radius: 3px; overflow: hidden;
+        }
+        
+        .hf-progress-fill {
+            background: var(--tone); height: 100%; transition: width 0.3s ease;
+        }
     </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+def stat_card_html(label, value, variant, large=False):
+    """
+    HTML kartu statistik gradient (class .hf-stat-card di apply_custom_css).
+    variant: red / blue / purple / green; large=True untuk kartu section Account Manager.
+    """
+    size = " hf-stat-card--lg" if large else ""
+    return f"""
+    <div class='hf-stat-card hf-stat-{variant}{size}'>
+        <div class='hf-stat-body'>
+            <div class='hf-stat-label'>{label}</div>
+            <div class='hf-stat-value'>{value}</div>
+        </div>
+    </div>
+    """
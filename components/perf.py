@@ -0,0 +1,257 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+from components.fragment_cache import get_fragment_cache
+
+# Tulis satu baris JSON per rerun ke logger components.perf, plus log durasi load data
+# dari components.data_refresher, ke stderr (HIGHFIVE_PERF_LOG=1)
+PERF_LOG = os.environ.get("HIGHFIVE_PERF_LOG") == "1"
+
+# Panel debug performa di sidebar (HIGHFIVE_PERF_PANEL=1, atau ?perf=1 di URL)
+PERF_PANEL = os.environ.get("HIGHFIVE_PERF_PANEL") == "1"
+
+# Profiling per fungsi dengan cProfile untuk setiap rerun (HIGHFIVE_PERF_PROFILE=1, mahal)
+PERF_PROFILE = os.environ.get("HIGHFIVE_PERF_PROFILE") == "1"
+
+# Jumlah rerun terakhir yang disimpan per session untuk panel
+PERF_HISTORY = 20
+
+# Jumlah fungsi teratas (cumulative time) yang disimpan dari hasil profiling
+PROFILE_TOP = 15
+
+logger = logging.getLogger(__name__)
+
+def _attach_stderr_handler(log):
+    """
+    Tulis log INFO ke stderr walaupun logging belum dikonfigurasi (level default WARNING).
+    Dipasang sekali per logger, aman dipanggil ulang saat modul di-reload (HIGHFIVE_DEV).
+    """
+    if any(getattr(handler, '_highfive_perf', False) for handler in log.handlers):
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler._highfive_perf = True
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+if PERF_LOG:
+    _attach_stderr_handler(logger)
+    _attach_stderr_handler(logging.getLogger('components.data_refresher'))
+
+class _ByteCounter:
+    """
+    Pembungkus ScriptRunContext._enqueue: menjumlahkan ukuran ForwardMsg yang dikirim ke browser
+    selama trace aktif. Dipasang sekali per session.
+    """
+
+    def __init__(self, enqueue):
+        self.enqueue = enqueue
+        self.trace = None
+
+    def __call__(self, msg):
+        if self.trace is not None:
+            self.trace['bytes'] += msg.ByteSize()
+            self.trace['messages'] += 1
+        self.enqueue(msg)
+
+def _byte_counter():
+    """Pasang (atau ambil) penghitung byte di context script run aktif; None jika tidak tersedia"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx is None or not hasattr(ctx, '_enqueue'):
+            return None
+        if not isinstance(ctx._enqueue, _ByteCounter):
+            ctx._enqueue = _ByteCounter(ctx._enqueue)
+        return ctx._enqueue
+    except Exception:
+        logger.debug("Penghitung byte tidak bisa dipasang", exc_info=True)
+        return None
+
+def panel_enabled():
+    """Panel performa aktif lewat env atau query param ?perf=1"""
+    return PERF_PANEL or st.query_params.get("perf") == "1"
+
+def begin_rerun():
+    """
+    Mulai trace untuk rerun ini (panggil di awal app.py).
+    Tanpa PERF_LOG / panel / profiling tidak ada yang direkam, span() jadi no-op.
+    """
+    # Rerun yang terputus (st.rerun / StopException) tidak sampai ke finish_rerun: tutup trace-nya dulu
+    leftover = st.session_state.pop('_perf_trace', None)
+    if leftover is not None:
+        _close_trace(leftover)
+
+    if not (PERF_LOG or PERF_PROFILE or panel_enabled()):
+        return None
+
+    cache_stats = get_fragment_cache().thread_stats()
+    trace = {
+        'started': time.perf_counter(),
+        'stages': {},
+        'bytes': 0,
+        'messages': 0,
+        'fragment_hits': cache_stats['hits'],
+        'fragment_misses': cache_stats['misses'],
+        'counter': _byte_counter(),
+        'profiler': None,
+    }
+    if trace['counter'] is not None:
+        trace['counter'].trace = trace
+    if PERF_PROFILE:
+        trace['profiler'] = cProfile.Profile()
+        trace['profiler'].enable()
+
+    st.session_state._perf_trace = trace
+    return trace
+
+@contextmanager
+def span(name):
+    """Catat durasi satu tahap rerun (ms) ke trace aktif; tahap yang sama dijumlahkan"""
+    trace = st.session_state.get('_perf_trace')
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        trace['stages'][name] = trace['stages'].get(name, 0) + elapsed
+
+def timed(name=None):
+    """Decorator span() untuk satu fungsi (default nama fungsinya)"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _profile_top(profiler):
+    """Fungsi teratas menurut cumulative time dari hasil cProfile"""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, func), (_, calls, _, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({func})",
+            'calls': calls,
+            'cumulative_ms': round(cumulative * 1000, 2),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:PROFILE_TOP]
+
+def _close_trace(trace):
+    """Matikan profiler dan lepas trace dari penghitung byte"""
+    if trace['profiler'] is not None:
+        trace['profiler'].disable()
+    if trace['counter'] is not None:
+        trace['counter'].trace = None
+
+def finish_rerun(**context):
+    """
+    Tutup trace rerun: hitung total, simpan ke riwayat session dan tulis baris JSON (jika PERF_LOG).
+    context: info tambahan untuk log (data source, WITEL, view mode, ...).
+    """
+    trace = st.session_state.pop('_perf_trace', None)
+    if trace is None:
+        return None
+
+    _close_trace(trace)
+
+    cache_stats = get_fragment_cache().thread_stats()
+    st.session_state._perf_rerun = st.session_state.get('_perf_rerun', 0) + 1
+    record = {
+        'event': 'rerun',
+        'rerun': st.session_state._perf_rerun,
+        'finished_at': time.time(),
+        'total_ms': round((time.perf_counter() - trace['started']) * 1000, 2),
+        'stages': {name: round(ms, 2) for name, ms in trace['stages'].items()},
+        'bytes': trace['bytes'] if trace['counter'] is not None else None,
+        'messages': trace['messages'] if trace['counter'] is not None else None,
+        'fragment_cache': {
+            'hits': cache_stats['hits'] - trace['fragment_hits'],
+            'misses': cache_stats['misses'] - trace['fragment_misses'],
+        },
+        **context,
+    }
+    if trace['profiler'] is not None:
+        record['profile'] = _profile_top(trace['profiler'])
+
+    history = st.session_state.get('_perf_history')
+    if history is None:
+        history = st.session_state._perf_history = deque(maxlen=PERF_HISTORY)
+    history.append(record)
+
+    if PERF_LOG:
+        logger.info(json.dumps(record, default=str))
+    return record
+
+def render_panel():
+    """Panel debug performa di sidebar: ringkasan N rerun terakhir dan breakdown rerun terakhir"""
+    history = st.session_state.get('_perf_history')
+    if not panel_enabled() or not history:
+        return
+
+    import pandas as pd
+
+    with st.sidebar.expander("⏱️ Performa rerun", expanded=False):
+        rows = []
+        for record in history:
+            row = {
+                'rerun': record['rerun'],
+                'total_ms': record['total_ms'],
+                'KB': round(record['bytes'] / 1024, 1) if record['bytes'] is not None else None,
+                'frag_hit': record['fragment_cache']['hits'],
+                'frag_miss': record['fragment_cache']['misses'],
+            }
+            row.update(record['stages'])
+            rows.append(row)
+        st.dataframe(pd.DataFrame(rows[::-1]), hide_index=True, use_container_width=True)
+
+        latest = history[-1]
+        st.caption(f"Rerun #{latest['rerun']} · {latest['total_ms']:.1f} ms · {latest['messages'] or 0} pesan")
+        stages = pd.DataFrame(
+            [{'tahap': name, 'ms': ms} for name, ms in sorted(latest['stages'].items(), key=lambda item: -item[1])]
+        )
+        st.dataframe(stages, hide_index=True, use_container_width=True)
+        if latest.get('profile'):
+            st.dataframe(pd.DataFrame(latest['profile']), hide_index=True, use_container_width=True)
+
+        _render_load_timings(pd)
+
+def _render_load_timings(pd):
+    """Durasi load/refresh terakhir per sheet dari refresher background"""
+    from components.data_refresher import get_refresher
+
+    timings = list(get_refresher().timings.values())
+    if not timings:
+        return
+    now = time.time()
+    rows = [
+        {
+            'sumber': timing['source'],
+            'jenis': timing['kind'],
+            'detik': timing['seconds'],
+            'baris': timing['rows'],
+            'umur_s': round(now - timing['finished_at']),
+        }
+        for timing in timings
+    ]
+    st.caption("Load data terakhir")
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
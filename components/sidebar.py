@@ -1,12 +1,16 @@
-import base64, io
+import base64, hashlib, io, logging, os
 from pathlib import Path
 
 import streamlit as st
-from PIL import Image, ImageFile
 
-# Amanin pembacaan gambar besar
-Image.MAX_IMAGE_PIXELS = None
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+from components.data_refresher import get_refresher
+from components.viz_piechart import DONUT_RENDERER, DONUT_RENDERERS
+
+# Folder file static Streamlit (server.enableStaticServing): <folder app.py>/static,
+# bukan relatif ke working directory proses
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+logger = logging.getLogger(__name__)
 
 # List Witel
 WITEL_LIST = [
@@ -20,12 +24,19 @@ WITEL_LIST = [
     "SOLO JATENG TIMUR",
 ]
 
-def _safe_logo(img_path: Path, width_px: int = 260, top_gap: int = 50):
+def _render_logo_png(img_path: Path, width_px: int) -> bytes:
     """
-    Render logo: center, jarak dari atas 'top_gap' px, lebar 'width_px' px.
-    Resize di runtime + fallback base64 agar lolos limit Pillow/versi Streamlit.
+    Resize logo ke lebar 'width_px' px lalu encode PNG.
+    Fallback ke isi file asli jika Pillow gagal (limit Pillow/format tidak dikenal).
+    Pillow baru di-import di sini (hanya saat cache logo miss).
     """
     try:
+        from PIL import Image, ImageFile
+
+        # Amanin pembacaan gambar besar
+        Image.MAX_IMAGE_PIXELS = None
+        ImageFile.LOAD_TRUNCATED_IMAGES = True
+
         with Image.open(img_path) as img:
             img = img.convert("RGBA")
             if img.width > width_px:
@@ -33,15 +44,56 @@ def _safe_logo(img_path: Path, width_px: int = 260, top_gap: int = 50):
                 img = img.resize((width_px, int(img.height * r)), Image.Resampling.LANCZOS)
             buf = io.BytesIO()
             img.save(buf, format="PNG")
-            b64 = base64.b64encode(buf.getvalue()).decode()
+            return buf.getvalue()
     except Exception:
         # fallback baca langsung file
-        b64 = base64.b64encode(open(img_path, "rb").read()).decode()
+        return img_path.read_bytes()
+
+def _publish_static(png: bytes, name: str) -> str:
+    """
+    Tulis PNG ke folder static/ (disajikan Streamlit di app/static/), return URL-nya.
+    Query ?v=<digest> membuat Streamlit mengirim header cache panjang dan berganti saat isi berubah.
+    """
+    path = STATIC_DIR / name
+    digest = hashlib.sha256(png).hexdigest()[:12]
+    if not path.exists() or path.read_bytes() != png:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(png)
+        os.replace(tmp_path, path)
+    return f"app/static/{name}?v={digest}"
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def logo_src(img_path: str, mtime_ns: int, width_px: int, static_serving: bool) -> str:
+    """
+    Sumber <img> logo, dihitung sekali per (path, mtime, lebar): URL static jika static serving aktif,
+    selain itu data URI base64. mtime_ns hanya dipakai sebagai key supaya file baru otomatis diproses ulang.
+    """
+    path = Path(img_path)
+    png = _render_logo_png(path, width_px)
+    if static_serving:
+        try:
+            return _publish_static(png, f"{path.stem}-{width_px}.png")
+        except OSError:
+            logger.warning("Gagal menulis logo ke %s, pakai base64", STATIC_DIR, exc_info=True)
+    return f"data:image/png;base64,{base64.b64encode(png).decode()}"
+
+def _safe_logo(img_path: Path, width_px: int = 260, top_gap: int = 50):
+    """
+    Render logo: center, jarak dari atas 'top_gap' px, lebar 'width_px' px.
+    Resize dan encode hanya sekali per versi file (lihat logo_src).
+    """
+    src = logo_src(
+        str(img_path),
+        img_path.stat().st_mtime_ns,
+        width_px,
+        bool(st.get_option("server.enableStaticServing")),
+    )
 
     st.markdown(
         f"""
         <div style="text-align:center; margin-top:{top_gap}px;">
-            <img src="data:image/png;base64,{b64}" style="width:{width_px}px; height:auto;" />
+            <img src="{src}" style="width:{width_px}px; height:auto;" />
         </div>
         """,
         unsafe_allow_html=True,
@@ -92,9 +144,32 @@ def render_sidebar():
 
         st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
 
-        # 3) REFRESH
+        # 3) TAMPILAN CHART (SVG lebih ringan untuk laptop low-end)
+        st.markdown(
+            """
+            <p style='color:#fff; font-size:13px; font-weight:700; margin-bottom:8px; letter-spacing:.5px;'>
+              📊 TAMPILAN CHART
+            </p>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        renderers = list(DONUT_RENDERERS)
+        renderer_label = st.selectbox(
+            "donut_renderer_select",
+            options=list(DONUT_RENDERERS.values()),
+            index=renderers.index(DONUT_RENDERER) if DONUT_RENDERER in renderers else 0,
+            key="donut_renderer_label",
+            label_visibility="collapsed",
+        )
+        st.session_state.donut_renderer = renderers[list(DONUT_RENDERERS.values()).index(renderer_label)]
+
+        st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
+
+        # 4) REFRESH
         if st.button("🔄 REFRESH DATA", use_container_width=True, key="refresh_btn"):
-            st.cache_data.clear()
+            with st.spinner("⏳ Memuat ulang data..."):
+                get_refresher().refresh_all(force=True)
             st.rerun()
 
         return selected_witel
@@ -1,78 +1,85 @@
+import html
+import math
+import os
+
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 
-def calculate_category_breakdown(df, category):
+from components.aggregates import CATEGORY_COLUMN, build_cube, summarize_categories, summarize_witel
+from components.layout import stat_card_html
+
+def calculate_category_stats(df):
+    """
+    Kalkulasi Win/Lose rate dan breakdown produk untuk SEMUA kategori sekaligus.
+    Satu groupby per (kategori, produk), bukan filter ulang df per kategori dan per produk.
+    Mengembalikan dictionary kategori -> {'win_rate', 'lose_rate', 'total_products', 'breakdown'}
+    """
+    return summarize_categories(build_cube(df, keys=[CATEGORY_COLUMN, 'PRODUCT']))
+
+def calculate_category_breakdown(df, category, stats=None):
     """
     Kalkulasi breakdown detail per produk dalam kategori
     Mengembalikan dictionary dengan detail Win dan Remaining per jenis produk
+    stats: hasil calculate_category_stats(df) supaya tidak dihitung ulang per kategori
     """
-    category_data = df[df['Kategori Product High Five'] == category].copy()
+    if stats is None:
+        stats = calculate_category_stats(df)
     
-    if len(category_data) == 0:
+    category_stats = stats.get(category)
+    if category_stats is None:
         return None
     
-    # Group by PRODUCT name
-    product_breakdown = {}
-    total_products = len(category_data)
-    
-    for product_name in category_data['PRODUCT'].unique():
-        product_data = category_data[category_data['PRODUCT'] == product_name]
-        count = len(product_data)
-        
-        # Hitung rata-rata % Results untuk produk ini
-        avg_result = product_data['% Results'].mean() if '% Results' in product_data.columns else 0
-        
-        product_breakdown[product_name] = {
-            'count': count,
-            'percentage': (count / total_products) * 100,
-            'avg_result': avg_result
-        }
-    
-    return product_breakdown
+    return category_stats['breakdown']
 
-def calculate_category_win_lose(df, category):
+def calculate_category_win_lose(df, category, stats=None):
     """
     Kalkulasi Win/Lose rate untuk sebuah kategori produk
     Win = rata-rata % Results dari semua produk dalam kategori
     Lose = 100% - Win
+    stats: hasil calculate_category_stats(df) supaya tidak dihitung ulang per kategori
     """
-    category_data = df[df['Kategori Product High Five'] == category]
+    if stats is None:
+        stats = calculate_category_stats(df)
     
-    if len(category_data) > 0:
-        valid_results = category_data['% Results'].dropna()
+    category_stats = stats.get(category)
+    if category_stats is None:
+        return 0, 100, 0
+    
+    return category_stats['win_rate'], category_stats['lose_rate'], category_stats['total_products']
+
+def breakdown_lines(product_breakdown):
+    """
+    Baris breakdown hover (progress, remaining) per produk, urut avg_result terbesar.
+    Produk tanpa kontribusi (0% atau NaN) tidak ditampilkan di sisi tersebut.
+    """
+    win_lines, remaining_lines = [], []
+    if not product_breakdown:
+        return win_lines, remaining_lines
+    
+    sorted_products = sorted(product_breakdown.items(), key=lambda x: x[1]['avg_result'], reverse=True)
+    for product_name, data in sorted_products:
+        win_contrib = data['avg_result']
+        remaining_contrib = 100 - data['avg_result']
+        count = data['count']
+        
+        if win_contrib > 0:
+            win_lines.append(f"{product_name}: {count} produk ({win_contrib:.1f}%)")
         
-        if len(valid_results) > 0:
-            avg_result = valid_results.mean()
-            win_rate = avg_result
-            lose_rate = 100 - avg_result
-            return win_rate, lose_rate, len(category_data)
+        if remaining_contrib > 0:
+            remaining_lines.append(f"{product_name}: {count} produk ({remaining_contrib:.1f}%)")
     
-    return 0, 100, 0
+    return win_lines, remaining_lines
 
-def create_pie_chart_with_breakdown(win_rate, lose_rate, product_breakdown):
-    """Create pie chart dengan breakdown detail di tooltip - CLEAN VERSION"""
+def create_donut_trace(win_rate, lose_rate, product_breakdown, domain=None):
+    """Trace donut PROGRESS/REMAINING dengan breakdown produk di hover (domain: posisi di figure gabungan)"""
+    import plotly.graph_objects as go  # import berat, hanya saat renderer Plotly dipakai
     
     # Build custom hover text dengan breakdown
-    win_breakdown_text = "<b>PROGRESS BREAKDOWN</b><br>"
-    remaining_breakdown_text = "<b>REMAINING BREAKDOWN</b><br>"
+    win_lines, remaining_lines = breakdown_lines(product_breakdown)
+    win_breakdown_text = "<b>PROGRESS BREAKDOWN</b><br>" + "".join(f"• {line}<br>" for line in win_lines)
+    remaining_breakdown_text = "<b>REMAINING BREAKDOWN</b><br>" + "".join(f"• {line}<br>" for line in remaining_lines)
     
-    if product_breakdown:
-        # Sort by avg_result descending
-        sorted_products = sorted(product_breakdown.items(), key=lambda x: x[1]['avg_result'], reverse=True)
-        
-        for product_name, data in sorted_products:
-            win_contrib = data['avg_result']
-            remaining_contrib = 100 - data['avg_result']
-            count = data['count']
-            
-            if win_contrib > 0:
-                win_breakdown_text += f"• {product_name}: {count} produk ({win_contrib:.1f}%)<br>"
-            
-            if remaining_contrib > 0:
-                remaining_breakdown_text += f"• {product_name}: {count} produk ({remaining_contrib:.1f}%)<br>"
-    
-    fig = go.Figure(data=[go.Pie(
+    return go.Pie(
         labels=['PROGRESS', 'REMAINING'],
         values=[win_rate, lose_rate],
         hole=0.65,
@@ -87,9 +94,23 @@ def create_pie_chart_with_breakdown(win_rate, lose_rate, product_breakdown):
                      '%{customdata}' +
                      '<extra></extra>',
         pull=[0.05, 0],
-        rotation=90
-    )])
-    
+        rotation=90,
+        domain=domain
+    )
+
+def create_donut_annotation(win_rate, x=0.5):
+    """Label progress rate di tengah donut (x: titik tengah domain donut)"""
+    return dict(
+        text=f'<b style="font-size: 32px; color: #ea1d25;">{win_rate:.1f}%</b><br>' +
+             f'<span style="font-size: 10px; color: #6b7280; font-weight: 600; letter-spacing: 0.5px;">PROGRESS RATE</span>',
+        x=x, y=0.5,
+        font=dict(family='Inter'),
+        showarrow=False,
+        align='center'
+    )
+
+def apply_donut_layout(fig, annotations):
+    """Layout bersama donut (ukuran, background transparan, style hover)"""
     fig.update_layout(
         showlegend=False,
         height=240,
@@ -103,22 +124,158 @@ def create_pie_chart_with_breakdown(win_rate, lose_rate, product_breakdown):
             bordercolor="#e5e7eb",
             align="left"
         ),
-        annotations=[
-            dict(
-                text=f'<b style="font-size: 32px; color: #ea1d25;">{win_rate:.1f}%</b><br>' +
-                     f'<span style="font-size: 10px; color: #6b7280; font-weight: 600; letter-spacing: 0.5px;">PROGRESS RATE</span>',
-                x=0.5, y=0.5,
-                font=dict(family='Inter'),
-                showarrow=False,
-                align='center'
-            )
-        ]
+        annotations=annotations
     )
-    
     return fig
 
-def render_piechart_visualization(df, selected_witel):
-    """Render section visualisasi pie chart per kategori produk untuk WITEL tertentu"""
+def create_pie_chart_with_breakdown(win_rate, lose_rate, product_breakdown):
+    """Create pie chart dengan breakdown detail di tooltip - CLEAN VERSION"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(data=[create_donut_trace(win_rate, lose_rate, product_breakdown)])
+    return apply_donut_layout(fig, [create_donut_annotation(win_rate)])
+
+def create_multi_donut_figure(category_stats):
+    """
+    Satu figure berisi donut semua kategori (satu domain per kategori, kiri ke kanan).
+    Layout dan hover dipakai bersama, jadi client cukup me-mount dan me-layout satu chart.
+    """
+    import plotly.graph_objects as go
+    
+    count = max(len(category_stats), 1)
+    gap = 0.04
+    traces, annotations = [], []
+    for idx, stats in enumerate(category_stats.values()):
+        x0, x1 = idx / count + gap / 2, (idx + 1) / count - gap / 2
+        traces.append(create_donut_trace(
+            stats['win_rate'], stats['lose_rate'], stats['breakdown'], domain=dict(x=[x0, x1], y=[0, 1])
+        ))
+        annotations.append(create_donut_annotation(stats['win_rate'], x=(x0 + x1) / 2))
+    
+    return apply_donut_layout(go.Figure(data=traces), annotations)
+
+# Donut SVG: keliling lingkaran tengah ring (viewBox 100x100, hole 0.65 seperti versi Plotly)
+SVG_DONUT_RADIUS = 38.75
+SVG_DONUT_WIDTH = 16.5
+SVG_DONUT_CIRCUMFERENCE = 2 * math.pi * SVG_DONUT_RADIUS
+
+def create_svg_donut(win_rate, lose_rate, product_breakdown):
+    """
+    Donut PROGRESS/REMAINING sebagai SVG inline + tooltip breakdown CSS (tanpa Plotly JS di client).
+    Arah dan titik awal irisan sama dengan versi Plotly (mulai jam 3, berlawanan jarum jam).
+    """
+    total = win_rate + lose_rate
+    share = win_rate / total if total > 0 else 0
+    progress_len = share * SVG_DONUT_CIRCUMFERENCE
+    remaining_len = SVG_DONUT_CIRCUMFERENCE - progress_len
+    gap = 0.8 if 0 < share < 1 else 0
+    
+    win_lines, remaining_lines = breakdown_lines(product_breakdown)
+    
+    def tooltip(kind, label, value, lines):
+        items = "".join(f"<li>{html.escape(line)}</li>" for line in lines)
+        return (
+            f"<div class='hf-donut-tip hf-donut-tip-{kind}'><b>{label}</b><span>{value:.1f}%</span>"
+            f"<small>{label} BREAKDOWN</small><ul>{items}</ul></div>"
+        )
+    
+    return f"""
+    <div class='hf-donut'>
+        <svg viewBox='0 0 100 100' role='img' aria-label='Progress {win_rate:.1f}%'>
+            <g transform='matrix(1 0 0 -1 0 100)' fill='none' stroke-width='{SVG_DONUT_WIDTH}'>
+                <circle class='hf-donut-remaining' cx='50' cy='50' r='{SVG_DONUT_RADIUS}' stroke='#e5e7eb'
+                        stroke-dasharray='{max(remaining_len - gap, 0):.3f} {SVG_DONUT_CIRCUMFERENCE:.3f}' stroke-dashoffset='{-progress_len:.3f}'/>
+                <circle class='hf-donut-progress' cx='50' cy='50' r='{SVG_DONUT_RADIUS}' stroke='#ea1d25'
+                        stroke-dasharray='{max(progress_len - gap, 0):.3f} {SVG_DONUT_CIRCUMFERENCE:.3f}'/>
+            </g>
+        </svg>
+        <div class='hf-donut-center'><b>{win_rate:.1f}%</b><small>PROGRESS RATE</small></div>
+        {tooltip('progress', 'PROGRESS', win_rate, win_lines)}
+        {tooltip('remaining', 'REMAINING', lose_rate, remaining_lines)}
+    </div>
+    """
+
+# Renderer donut kategori: "plotly" (satu chart per kategori), "combined" (satu figure semua kategori)
+# atau "svg" (ringan, tanpa Plotly JS)
+DONUT_RENDERERS = {
+    "plotly": "Plotly (interaktif)",
+    "combined": "Plotly (satu figure)",
+    "svg": "SVG (ringan)",
+}
+DONUT_RENDERER = os.environ.get("HIGHFIVE_DONUT_RENDERER", "plotly")
+
+def get_donut_renderer():
+    """Renderer aktif: pilihan user di sidebar, default dari env HIGHFIVE_DONUT_RENDERER"""
+    renderer = st.session_state.get('donut_renderer', DONUT_RENDERER)
+    return renderer if renderer in DONUT_RENDERERS else "plotly"
+
+# Jumlah figure donut yang disimpan (source × WITEL × kategori × revisi data)
+FIGURE_CACHE_SIZE = 256
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def get_category_figure(data_source, witel, category, version, _stats):
+    """
+    Figure donut satu kategori, dibangun sekali per (source, WITEL, kategori, revisi data)
+    dan dipakai bersama oleh semua session. _stats tidak ikut di-hash (sudah ditentukan oleh key lain).
+    Figure hasil cache tidak boleh dimodifikasi.
+    """
+    return create_pie_chart_with_breakdown(_stats['win_rate'], _stats['lose_rate'], _stats['breakdown'])
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def get_multi_donut_figure(data_source, witel, version, _category_stats):
+    """Figure gabungan semua kategori, dibangun sekali per (source, WITEL, revisi data)"""
+    return create_multi_donut_figure(_category_stats)
+
+def multi_donut_figure(category_stats, selected_witel, dataset=None):
+    """Figure gabungan dari cache jika versi data diketahui, selain itu dibangun langsung"""
+    if dataset is None or dataset.version is None:
+        return create_multi_donut_figure(category_stats)
+    version = dataset.revision(selected_witel)
+    return get_multi_donut_figure(dataset.data_source, selected_witel, version, category_stats)
+
+def category_figure(stats, category, selected_witel, dataset=None):
+    """Figure donut dari cache jika versi data diketahui, selain itu dibangun langsung"""
+    if dataset is None or dataset.version is None:
+        return create_pie_chart_with_breakdown(stats['win_rate'], stats['lose_rate'], stats['breakdown'])
+    version = dataset.revision(selected_witel, category)
+    return get_category_figure(dataset.data_source, selected_witel, category, version, stats)
+
+def render_category_header(category, stats):
+    """Judul kategori + jumlah produk di atas donut"""
+    # Category title - BIG & BOLD
+    st.markdown(f"""
+    <div class='hf-category-head'>
+        <h3>{category}</h3>
+        <span class='hf-category-count'>📦 {stats['total_products']} PRODUK</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_category_rates(stats):
+    """Kotak Progress & Remaining di bawah donut"""
+    # Stats Progress & Remaining - SIMPLE
+    col_prog, col_rem = st.columns(2)
+    with col_prog:
+        st.markdown(f"""
+        <div class='hf-rate-box hf-rate-progress'>
+            <div class='hf-rate-value'>{stats['win_rate']:.1f}%</div>
+            <div class='hf-rate-label'>Progress</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_rem:
+        st.markdown(f"""
+        <div class='hf-rate-box hf-rate-remaining'>
+            <div class='hf-rate-value'>{stats['lose_rate']:.1f}%</div>
+            <div class='hf-rate-label'>Remaining</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_piechart_visualization(df, selected_witel, summary=None, dataset=None):
+    """
+    Render section visualisasi pie chart per kategori produk untuk WITEL tertentu.
+    summary: hasil Dataset.summary() (dihitung sekali per versi data); jika None dihitung dari df.
+    dataset: Dataset asal df, dipakai sebagai key cache figure (source + revisi WITEL/kategori).
+    """
     
     # Section Header - MODERN DESIGN
     st.markdown(f"""
@@ -155,145 +312,64 @@ def render_piechart_visualization(df, selected_witel):
         st.info("Pastikan sheet memiliki kolom: Kategori Product High Five, PRODUCT, % Results")
         return
     
+    if summary is None:
+        summary = summarize_witel(build_cube(df))
+    
     # Get unique categories
-    categories = df['Kategori Product High Five'].dropna().unique()
+    categories = summary['categories']
     
     if len(categories) == 0:
         st.warning("Tidak ada kategori produk yang ditemukan di data")
         return
     
     # Overall statistics - MODERN CARDS
-    total_records = len(df)
+    total_records = summary['total_records']
     total_categories = len(categories)
-    overall_avg_result = df['% Results'].dropna().mean() if '% Results' in df.columns else 0
+    overall_avg_result = summary['avg_result']
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #ea1d25 0%, #d61921 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(234, 29, 37, 0.25); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Total Records
-                </div>
-                <div style='color: white; font-size: 2.5rem; font-weight: 900; text-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                    {total_records}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(stat_card_html("Total Records", total_records, "red"), unsafe_allow_html=True)
     
     with col2:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(59, 130, 246, 0.25); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Total Kategori
-                </div>
-                <div style='color: white; font-size: 2.5rem; font-weight: 900; text-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                    {total_categories}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(stat_card_html("Total Kategori", total_categories, "blue"), unsafe_allow_html=True)
     
     with col3:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #10b981 0%, #047857 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(16, 185, 129, 0.25); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Avg Progress
-                </div>
-                <div style='color: white; font-size: 2.5rem; font-weight: 900; text-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                    {overall_avg_result:.1f}%
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(stat_card_html("Avg Progress", f"{overall_avg_result:.1f}%", "green"), unsafe_allow_html=True)
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Render pie charts - SIMPLE CLEAN
+    renderer = get_donut_renderer()
+    category_stats = summary['category_stats']
+    
+    if renderer == "combined":
+        # Judul per kolom, satu figure untuk semua donut, lalu rate per kolom
+        for col, category in zip(st.columns(len(categories)), categories):
+            with col:
+                render_category_header(category, category_stats[category])
+        
+        fig = multi_donut_figure(category_stats, selected_witel, dataset)
+        st.plotly_chart(fig, use_container_width=True, key="pie_combined", config={'displayModeBar': False})
+        
+        for col, category in zip(st.columns(len(categories)), categories):
+            with col:
+                render_category_rates(category_stats[category])
+        return
+    
     cols = st.columns(len(categories))
     
     for idx, category in enumerate(categories):
         with cols[idx]:
-            win_rate, lose_rate, total_products = calculate_category_win_lose(df, category)
-            product_breakdown = calculate_category_breakdown(df, category)
-            
-            # Category title - BIG & BOLD
-            st.markdown(f"""
-            <div style='text-align: center; margin-bottom: 8px;'>
-                <h3 style='color: #1a202c; margin: 0 0 12px 0; font-size: 1.375rem; 
-                          font-weight: 900; letter-spacing: -0.02em;'>
-                    {category}
-                </h3>
-                <div style='background: linear-gradient(135deg, #f5f5f5 0%, #e5e7eb 100%); 
-                            padding: 6px 14px; border-radius: 20px; display: inline-block;'>
-                    <span style='color: #4a5568; font-size: 0.75rem; font-weight: 700; 
-                                letter-spacing: 0.5px;'>
-                        📦 {total_products} PRODUK
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            stats = category_stats[category]
+            render_category_header(category, stats)
             
             # Pie chart with hover breakdown
-            fig = create_pie_chart_with_breakdown(win_rate, lose_rate, product_breakdown)
-            st.plotly_chart(fig, use_container_width=True, key=f"pie_{category}_{idx}", config={'displayModeBar': False})
-            
-            # Stats Progress & Remaining - SIMPLE
-            col_prog, col_rem = st.columns(2)
-            with col_prog:
-                st.markdown(f"""
-                <div style='text-align: center; padding: 12px; 
-                            background: linear-gradient(135deg, rgba(234, 29, 37, 0.1) 0%, rgba(234, 29, 37, 0.05) 100%); 
-                            border-radius: 12px; border: 2px solid rgba(234, 29, 37, 0.2);'>
-                    <div style='color: #ea1d25; font-size: 1.25rem; font-weight: 800;'>
-                        {win_rate:.1f}%
-                    </div>
-                    <div style='color: #6b7280; font-size: 0.65rem; font-weight: 700; 
-                               text-transform: uppercase; letter-spacing: 0.05em; margin-top: 4px;'>
-                        Progress
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            if renderer == "svg":
+                st.markdown(create_svg_donut(stats['win_rate'], stats['lose_rate'], stats['breakdown']), unsafe_allow_html=True)
+            else:
+                fig = category_figure(stats, category, selected_witel, dataset)
+                st.plotly_chart(fig, use_container_width=True, key=f"pie_{category}_{idx}", config={'displayModeBar': False})
             
-            with col_rem:
-                st.markdown(f"""
-                <div style='text-align: center; padding: 12px; 
-                            background: linear-gradient(135deg, #f5f5f5 0%, #e5e7eb 100%); 
-                            border-radius: 12px; border: 2px solid #d1d5db;'>
-                    <div style='color: #4a5568; font-size: 1.25rem; font-weight: 800;'>
-                        {lose_rate:.1f}%
-                    </div>
-                    <div style='color: #9ca3af; font-size: 0.65rem; font-weight: 700; 
-                               text-transform: uppercase; letter-spacing: 0.05em; margin-top: 4px;'>
-                        Remaining
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
\ No newline at end of file
+            render_category_rates(stats)
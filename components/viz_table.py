@@ -1,6 +1,15 @@
+import textwrap
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
+from components.aggregates import build_cube, summarize_witel
+from components.dataset import sort_positions
+from components.fragment_cache import fragment_key, get_fragment_cache
+from components.layout import stat_card_html
+from components.perf import span, timed
+
 def format_currency(value):
     """Format nilai menjadi format currency Indonesia"""
     if pd.isna(value) or value == 0:
@@ -20,6 +29,19 @@ def get_progress_color(progress):
     else:
         return "#ef4444"
 
+def get_progress_tone(progress):
+    """Class CSS warna progress (.hf-tone-*), threshold sama dengan get_progress_color"""
+    if pd.isna(progress):
+        return "hf-tone-gray"
+    elif progress >= 75:
+        return "hf-tone-green"
+    elif progress >= 50:
+        return "hf-tone-amber"
+    elif progress >= 25:
+        return "hf-tone-blue"
+    else:
+        return "hf-tone-red"
+
 def get_progress_label(progress):
     """Dapatkan label status berdasarkan progress"""
     if pd.isna(progress):
@@ -33,143 +55,263 @@ def get_progress_label(progress):
     else:
         return "Perlu Perhatian"
 
+# Jumlah AM per halaman di card mode
+CARD_PAGE_SIZE = 20
+
+# Jumlah baris per halaman di table mode
+TABLE_PAGE_SIZE = 100
+
+# Kolom tabel detail
+TABLE_COLUMNS = ['AM', 'CUSTOMER_NAME', 'PRODUCT', 'NILAI', '% Progress', '% Results', 'Progress']
+
+# Pilihan sort table mode: label -> (kolom, ascending)
+TABLE_SORTS = {
+    "AM · Customer · Produk": (['AM', 'CUSTOMER_NAME', 'PRODUCT'], True),
+    "Nilai terbesar": (['NILAI'], False),
+    "Progress tertinggi": (['% Progress'], False),
+    "Progress terendah": (['% Progress'], True),
+    "Result tertinggi": (['% Results'], False),
+}
+
+# Kolom yang dipakai card mode, urutan sesuai unpacking di group_card_rows
+CARD_COLUMNS = ['AM', 'CUSTOMER_NAME', 'PRODUCT', 'NILAI', '% Progress', '% Results', 'Progress']
+
+def group_card_rows(df):
+    """
+    Kelompokkan baris menjadi AM -> customer -> list produk dalam satu pass (O(rows)).
+    Urutan customer dan produk mengikuti kemunculan di data; kolom yang tidak ada diisi NaN.
+    """
+    groups = {}
+    rows = df.reindex(columns=CARD_COLUMNS).itertuples(index=False, name=None)
+    for am_name, customer_name, *product in rows:
+        if pd.isna(customer_name):
+            customer_name = '-'
+        groups.setdefault(am_name, {}).setdefault(customer_name, []).append(product)
+    return groups
+
+def set_page(state_key, page):
+    """Callback tombol navigasi halaman (jalan sebelum rerun, tanpa st.rerun tambahan)"""
+    st.session_state[state_key] = page
+
+def render_pager(total_items, page_size, prefix, item_label):
+    """
+    Render navigasi halaman (prev/next) dengan state di session_state[f"{prefix}_page"].
+    Return index halaman aktif (di-clamp ke jumlah halaman yang ada).
+    """
+    state_key = f"{prefix}_page"
+    total_pages = max(1, -(-total_items // page_size))
+    page = max(0, min(st.session_state.get(state_key, 0), total_pages - 1))
+    
+    first, last = min(page * page_size + 1, total_items), min((page + 1) * page_size, total_items)
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    
+    with col_prev:
+        st.button(
+            "◀ Sebelumnya",
+            key=f"{prefix}_prev",
+            use_container_width=True,
+            disabled=page == 0,
+            on_click=set_page,
+            args=(state_key, page - 1)
+        )
+    
+    with col_info:
+        st.markdown(f"""
+        <div style='text-align: center; color: #6b7280; font-size: 0.875rem; font-weight: 600; padding-top: 8px;'>
+            {item_label} {first}–{last} dari {total_items} · Halaman {page + 1}/{total_pages}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_next:
+        st.button(
+            "Berikutnya ▶",
+            key=f"{prefix}_next",
+            use_container_width=True,
+            disabled=page >= total_pages - 1,
+            on_click=set_page,
+            args=(state_key, page + 1)
+        )
+    
+    return page
+
+def render_card_pager(total_ams):
+    """Render navigasi halaman AM (prev/next), return index halaman aktif"""
+    return render_pager(total_ams, CARD_PAGE_SIZE, "card", "AM")
+
+def build_product_html(product_name, nilai, progress, result, progress_status):
+    """HTML kartu satu produk (style di class .hf-product, warna dari class tone)"""
+    if pd.isna(progress):
+        progress = 0
+    
+    if pd.isna(result):
+        result = 0
+    
+    if pd.isna(progress_status) or str(progress_status) == 'nan':
+        progress_status = '-'
+    
+    return f"""
+    <div class='hf-product {get_progress_tone(progress)}'>
+        <div class='hf-product-grid'>
+            <div>
+                <div class='hf-product-name'>📦 {product_name}</div>
+                <div class='hf-product-nilai'>{format_currency(nilai)}</div>
+            </div>
+            <div class='hf-metric'><b class='hf-progress-value'>{progress:.0f}%</b><small>Progress</small></div>
+            <div class='hf-metric'><b>{result:.0f}%</b><small>Result</small></div>
+            <div class='hf-metric'><span class='hf-status-chip'>{progress_status}</span></div>
+        </div>
+        <div class='hf-progress-track'><div class='hf-progress-fill' style='width: {progress}%;'></div></div>
+    </div>
+    """
+
+def customer_total(products):
+    """Total NILAI produk satu customer (NaN dilewati)"""
+    return sum(nilai for _, nilai, *_ in products if pd.notna(nilai))
+
+def build_customer_html(customer_name, products, customer_nilai=None):
+    """HTML header kartu customer (nama, jumlah produk, total NILAI)"""
+    if customer_nilai is None:
+        customer_nilai = customer_total(products)
+    
+    return f"""
+    <div class='hf-customer'>
+        <div class='hf-customer-info'>
+            <div class='hf-customer-name'>🏢 {customer_name}</div>
+            <div class='hf-customer-count'>{len(products)} Produk</div>
+        </div>
+        <div class='hf-customer-nilai'>{format_currency(customer_nilai)}</div>
+    </div>
+    """
+
+def build_am_summary_html(am_row):
+    """HTML baris ringkasan AM: progress bar + total nilai (kiri), badge status (kanan)"""
+    prog_val = am_row.Avg_Progress
+    
+    return f"""
+    <div class='hf-am-summary'>
+        <div>
+            <div class='hf-am-bar' style='width: {prog_val}%;'></div>
+            <div class='hf-am-total'>Total Nilai: <span>{format_currency(am_row.Total_Nilai)}</span></div>
+        </div>
+        <div class='hf-am-status'>
+            <span class='hf-badge {get_progress_tone(prog_val)}'>{get_progress_label(prog_val)}</span>
+        </div>
+    </div>
+    <br>
+    """
+
+def compact_html(build, *args):
+    """Bangun fragmen lalu dedent + strip (seperti yang dilakukan st.markdown per elemen)"""
+    return textwrap.dedent(build(*args)).strip()
+
+def build_am_detail_html(am_row, customers):
+    """
+    Satu dokumen HTML untuk seluruh detail AM (ringkasan + semua customer dan produknya).
+    Fragmen di-dedent lalu digabung tanpa baris kosong supaya markdown memperlakukannya sebagai satu blok HTML.
+    Kartu customer dan produk diambil dari fragment cache (key: field yang ditampilkan),
+    jadi rerun yang tidak mengubah data tidak membangun ulang HTML-nya.
+    """
+    cache = get_fragment_cache()
+    fragments = [compact_html(build_am_summary_html, am_row)]
+    for customer_name, products in customers.items():
+        customer_nilai = customer_total(products)
+        fragments.append(cache.get(
+            fragment_key('customer', (customer_name, len(products), customer_nilai)),
+            compact_html, build_customer_html, customer_name, products, customer_nilai
+        ))
+        fragments.extend(
+            cache.get(fragment_key('product', product), compact_html, build_product_html, *product)
+            for product in products
+        )
+    
+    return "<div>\n" + "\n".join(fragments) + "\n</div>"
+
+@timed("am_detail")
+def render_am_detail(am_row, customers):
+    """Render detail satu AM dalam satu st.markdown (satu delta, bukan satu per customer/produk)"""
+    st.markdown(build_am_detail_html(am_row, customers), unsafe_allow_html=True)
+
 def render_card_mode(df, am_groups):
-    """Render Card Mode - Clean design without gradient"""
+    """
+    Render Card Mode - Clean design without gradient.
+    Header AM diambil dari am_groups dan dipaginasi per CARD_PAGE_SIZE; detail customer/produk
+    hanya dibangun untuk AM yang sedang dibuka, jadi biaya render awal tidak bergantung jumlah AM.
+    """
     
-    for idx, am_row in am_groups.iterrows():
-        am_name = am_row['AM']
-        am_data = df[df['AM'] == am_name].copy()
-        prog_val = am_row['Avg_Progress']
-        
-        # AM Card with clean design
-        with st.expander(
-            f"**{am_name}** - {am_row['Total_Customers']} Customer | {am_row['Total_Products']} Produk | Progress: {prog_val:.1f}%",
-            expanded=False
-        ):
-            # AM Summary Row
-            col_a, col_b = st.columns([1, 1])
-            
-            with col_a:
-                st.markdown(f"""
-                <div style='background: #ea1d25; 
-                            height: 8px; border-radius: 4px; margin-bottom: 12px; width: {prog_val}%;'></div>
-                <div style='color: #4a5568; font-size: 0.875rem; font-weight: 500;'>
-                    Total Nilai: <span style='color: #ea1d25; font-weight: 800; font-size: 1.125rem;'>{format_currency(am_row['Total_Nilai'])}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col_b:
-                st.markdown(f"""
-                <div style='text-align: right; padding-top: 16px;'>
-                    <span style='background: {get_progress_color(prog_val)}; color: white; 
-                                padding: 6px 16px; border-radius: 16px; font-size: 0.8125rem; 
-                                font-weight: 700; display: inline-block;
-                                box-shadow: 0 2px 8px {get_progress_color(prog_val)}30;'>
-                        {get_progress_label(prog_val)}
-                    </span>
-                </div>
-                """, unsafe_allow_html=True)
+    page = render_card_pager(len(am_groups))
+    page_groups = am_groups.iloc[page * CARD_PAGE_SIZE:(page + 1) * CARD_PAGE_SIZE]
+    
+    # AM yang dibuka (state toggle dari rerun sebelumnya); baris mereka dikelompokkan sekaligus
+    open_ams = [am_name for am_name in page_groups['AM'] if st.session_state.get(f"am_detail_{am_name}")]
+    with span("card_grouping"):
+        card_groups = group_card_rows(df[df['AM'].isin(open_ams)]) if open_ams else {}
+    
+    with span("card_loop"):
+        for am_row in page_groups.itertuples(index=False):
+            am_name = am_row.AM
             
-            st.markdown("<br>", unsafe_allow_html=True)
+            # AM header; detail hanya dirender saat dibuka
+            is_open = st.toggle(
+                f"**{am_name}** - {am_row.Total_Customers} Customer | {am_row.Total_Products} Produk | Progress: {am_row.Avg_Progress:.1f}%",
+                key=f"am_detail_{am_name}"
+            )
             
-            # Customer sections
-            for customer_name in am_data['CUSTOMER_NAME'].unique():
-                customer_data = am_data[am_data['CUSTOMER_NAME'] == customer_name]
-                
-                st.markdown(f"""
-                <div style='background: #ffffff; border-left: 5px solid #ea1d25; 
-                            padding: 16px 20px; margin-bottom: 10px; margin-top: 24px; border-radius: 10px;
-                            box-shadow: 0 2px 6px rgba(0,0,0,0.08); border: 1px solid #e5e7eb;'>
-                    <div style='display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 12px;'>
-                        <div style='flex: 1; min-width: 200px;'>
-                            <div style='color: #1a202c; font-weight: 800; font-size: 1.125rem; margin-bottom: 4px;'>
-                                🏢 {customer_name}
-                            </div>
-                            <div style='color: #9ca3af; font-size: 0.8125rem; font-weight: 600;'>
-                                {len(customer_data)} Produk
-                            </div>
-                        </div>
-                        <div style='text-align: right;'>
-                            <div style='color: #ea1d25; font-weight: 900; font-size: 1.25rem;'>
-                                {format_currency(customer_data['NILAI'].sum())}
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Products for this customer
-                for _, prod_row in customer_data.iterrows():
-                    progress = prod_row.get('% Progress', 0)
-                    if pd.isna(progress):
-                        progress = 0
-                    
-                    result = prod_row.get('% Results', 0)
-                    if pd.isna(result):
-                        result = 0
-                    
-                    progress_status = prod_row.get('Progress', '-')
-                    if pd.isna(progress_status) or str(progress_status) == 'nan':
-                        progress_status = '-'
-                    
-                    st.markdown(f"""
-                    <div style='background: #f9fafb; padding: 14px 16px; margin-bottom: 8px; 
-                                border-radius: 8px; border-left: 4px solid {get_progress_color(progress)};
-                                border: 1px solid #e5e7eb; border-left: 4px solid {get_progress_color(progress)};'>
-                        <div style='display: grid; grid-template-columns: 2fr 1fr 1fr 1fr; gap: 16px; align-items: center;'>
-                            <div>
-                                <div style='color: #1a202c; font-weight: 700; font-size: 0.9375rem; margin-bottom: 4px;'>
-                                    📦 {prod_row['PRODUCT']}
-                                </div>
-                                <div style='color: #6b7280; font-size: 0.75rem; font-weight: 500;'>
-                                    {format_currency(prod_row['NILAI'])}
-                                </div>
-                            </div>
-                            <div style='text-align: center;'>
-                                <div style='color: {get_progress_color(progress)}; font-weight: 800; font-size: 1.0625rem;'>
-                                    {progress:.0f}%
-                                </div>
-                                <div style='color: #9ca3af; font-size: 0.6875rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em;'>
-                                    Progress
-                                </div>
-                            </div>
-                            <div style='text-align: center;'>
-                                <div style='color: #4a5568; font-weight: 800; font-size: 1.0625rem;'>
-                                    {result:.0f}%
-                                </div>
-                                <div style='color: #9ca3af; font-size: 0.6875rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em;'>
-                                    Result
-                                </div>
-                            </div>
-                            <div style='text-align: center;'>
-                                <div style='background: #e5e7eb; color: #4a5568; padding: 4px 10px; 
-                                           border-radius: 6px; font-size: 0.75rem; font-weight: 700; display: inline-block;'>
-                                    {progress_status}
-                                </div>
-                            </div>
-                        </div>
-                        <div style='margin-top: 12px;'>
-                            <div style='background: #e5e7eb; height: 6px; border-radius: 3px; overflow: hidden;'>
-                                <div style='background: {get_progress_color(progress)}; height: 100%; width: {progress}%; 
-                                           transition: width 0.3s ease;'></div>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+            if is_open:
+                with st.container(border=True):
+                    render_am_detail(am_row, card_groups.get(am_name, {}))
+
+def table_sort_order(df, sort_label, dataset=None, witel=None):
+    """Urutan baris tabel (posisi iloc) untuk pilihan sort; di-memo di Dataset jika tersedia"""
+    columns, ascending = TABLE_SORTS[sort_label]
+    if dataset is not None:
+        return dataset.sort_order(witel, columns, ascending)
+    return sort_positions(df, columns, ascending)
+
+def request_table_jump():
+    """Callback pilihan AM: lompatan halaman dihitung di render_table_mode (butuh urutan aktif)"""
+    st.session_state.table_jump_pending = True
 
-def render_table_mode(df):
-    """Render Table Mode - Full dataframe view"""
+def reset_table_page():
+    """Callback ganti sort: kembali ke halaman pertama"""
+    st.session_state.table_page = 0
+
+def render_table_mode(df, dataset=None, witel=None):
+    """
+    Render Table Mode - tabel terurut dan dipaginasi di server.
+    Urutan baris per pilihan sort dihitung sekali per versi data (Dataset.sort_order),
+    lalu hanya halaman yang terlihat yang dikirim ke st.dataframe.
+    """
     
     st.markdown("#### 📋 Tabel Detail Semua Data")
     
-    # Prepare display data
-    display_data = df[['AM', 'CUSTOMER_NAME', 'PRODUCT', 'NILAI', '% Progress', '% Results', 'Progress']].copy()
-    display_data = display_data.sort_values(['AM', 'CUSTOMER_NAME', 'PRODUCT'])
+    col_sort, col_jump = st.columns(2)
+    with col_sort:
+        sort_label = st.selectbox("Urutkan", list(TABLE_SORTS), key="table_sort", on_change=reset_table_page)
+    with col_jump:
+        am_options = ["-- Semua AM --"] + sorted(df['AM'].dropna().unique().tolist())
+        jump_am = st.selectbox("Lompat ke AM", am_options, key="table_jump_am", on_change=request_table_jump)
+    
+    with span("table_sort"):
+        order = table_sort_order(df, sort_label, dataset, witel)
+    
+    # Lompat ke halaman yang memuat baris pertama AM terpilih (pada urutan aktif)
+    if st.session_state.pop('table_jump_pending', False) and jump_am != am_options[0]:
+        matches = np.flatnonzero(df['AM'].to_numpy()[order] == jump_am)
+        if len(matches):
+            st.session_state.table_page = int(matches[0]) // TABLE_PAGE_SIZE
+    
+    page = render_pager(len(order), TABLE_PAGE_SIZE, "table", "Baris")
+    page_rows = order[page * TABLE_PAGE_SIZE:(page + 1) * TABLE_PAGE_SIZE]
+    
+    # Prepare display data (hanya baris halaman ini)
+    display_data = df.iloc[page_rows].reindex(columns=TABLE_COLUMNS)
+    
+    # Kolom angka tetap numeric (sort numerik, payload Arrow kecil); format lewat column_config
+    display_data[['NILAI', '% Progress', '% Results']] = display_data[['NILAI', '% Progress', '% Results']].fillna(0)
     
-    # Format columns
-    display_data['NILAI'] = display_data['NILAI'].apply(format_currency)
-    display_data['% Progress'] = display_data['% Progress'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0%")
-    display_data['% Results'] = display_data['% Results'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0%")
+    # Categorical hasil partisi WITEL masih membawa kategori semua WITEL, buang supaya dictionary Arrow kecil
+    for col in display_data.select_dtypes('category').columns:
+        display_data[col] = display_data[col].cat.remove_unused_categories()
     
     # Display dataframe
     st.dataframe(
@@ -181,15 +323,21 @@ def render_table_mode(df):
             "AM": st.column_config.TextColumn("Account Manager", width="medium"),
             "CUSTOMER_NAME": st.column_config.TextColumn("Customer", width="large"),
             "PRODUCT": st.column_config.TextColumn("Product", width="medium"),
-            "NILAI": st.column_config.TextColumn("Nilai", width="small"),
-            "% Progress": st.column_config.TextColumn("Progress", width="small"),
-            "% Results": st.column_config.TextColumn("Result", width="small"),
+            "NILAI": st.column_config.NumberColumn("Nilai", width="small", format="Rp %d"),
+            "% Progress": st.column_config.NumberColumn("Progress", width="small", format="%.1f%%"),
+            "% Results": st.column_config.NumberColumn("Result", width="small", format="%.1f%%"),
             "Progress": st.column_config.TextColumn("Status", width="small")
         }
     )
+    
+    st.caption(f"Total {len(order)} baris · Total Nilai {format_currency(df['NILAI'].sum())}")
 
-def render_table_visualization(df, selected_witel):
-    """Main function untuk render section Progress Account Manager"""
+def render_table_visualization(df, selected_witel, summary=None, dataset=None):
+    """
+    Main function untuk render section Progress Account Manager.
+    summary: hasil Dataset.summary() (dihitung sekali per versi data); jika None dihitung dari df.
+    dataset: Dataset asal df, dipakai untuk urutan tabel yang di-memo per versi data.
+    """
     
     # Initialize session state
     if 'view_mode' not in st.session_state:
@@ -266,114 +414,29 @@ def render_table_visualization(df, selected_witel):
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Prepare data
-    am_groups = df.groupby('AM').agg({
-        'CUSTOMER_NAME': 'nunique',
-        'PRODUCT': 'count',
-        'NILAI': 'sum',
-        '% Progress': 'mean'
-    }).reset_index()
-    
-    am_groups.columns = ['AM', 'Total_Customers', 'Total_Products', 'Total_Nilai', 'Avg_Progress']
-    am_groups = am_groups.sort_values('Total_Nilai', ascending=False)
+    # Prepare data (agregat per AM dari aggregate cube)
+    if summary is None:
+        with span("am_groups"):
+            summary = summarize_witel(build_cube(df))
+    am_groups = summary['am_groups']
     
     # Summary cards dengan gradient (tetap pakai gradient di summary)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #ea1d25 0%, #c41e24 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(234, 29, 37, 0.3); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Account Manager
-                </div>
-                <div style='color: white; font-size: 2.75rem; font-weight: 900; 
-                           text-shadow: 0 2px 8px rgba(0,0,0,0.2);'>
-                    {len(am_groups)}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(stat_card_html("Account Manager", len(am_groups), "red", large=True), unsafe_allow_html=True)
     
     with col2:
-        total_customers = df['CUSTOMER_NAME'].nunique()
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(59, 130, 246, 0.3); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Total Customer
-                </div>
-                <div style='color: white; font-size: 2.75rem; font-weight: 900; 
-                           text-shadow: 0 2px 8px rgba(0,0,0,0.2);'>
-                    {total_customers}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        total_customers = summary['total_customers']
+        st.markdown(stat_card_html("Total Customer", total_customers, "blue", large=True), unsafe_allow_html=True)
     
     with col3:
-        total_products = len(df)
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #8b5cf6 0%, #7c3aed 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(139, 92, 246, 0.3); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Total Produk
-                </div>
-                <div style='color: white; font-size: 2.75rem; font-weight: 900; 
-                           text-shadow: 0 2px 8px rgba(0,0,0,0.2);'>
-                    {total_products}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        total_products = summary['total_records']
+        st.markdown(stat_card_html("Total Produk", total_products, "purple", large=True), unsafe_allow_html=True)
     
     with col4:
-        avg_progress = df['% Progress'].mean()
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #10b981 0%, #047857 100%); 
-                    padding: 24px; border-radius: 18px; 
-                    box-shadow: 0 8px 24px rgba(16, 185, 129, 0.3); 
-                    text-align: center; border: 2px solid rgba(255,255,255,0.1);
-                    position: relative; overflow: hidden;'>
-            <div style='position: absolute; top: -30px; right: -30px; 
-                        width: 120px; height: 120px; background: rgba(255,255,255,0.08); 
-                        border-radius: 50%;'></div>
-            <div style='position: relative; z-index: 1;'>
-                <div style='color: rgba(255,255,255,0.85); font-size: 0.75rem; font-weight: 700; 
-                           text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>
-                    Avg Progress
-                </div>
-                <div style='color: white; font-size: 2.75rem; font-weight: 900; 
-                           text-shadow: 0 2px 8px rgba(0,0,0,0.2);'>
-                    {avg_progress:.1f}%
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        avg_progress = summary['avg_progress']
+        st.markdown(stat_card_html("Avg Progress", f"{avg_progress:.1f}%", "green", large=True), unsafe_allow_html=True)
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
@@ -381,4 +444,4 @@ def render_table_visualization(df, selected_witel):
     if st.session_state.view_mode == 'card':
         render_card_mode(df, am_groups)
     else:
-        render_table_mode(df)
\ No newline at end of file
+        render_table_mode(df, dataset, selected_witel)
\ No newline at end of file
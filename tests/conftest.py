@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.sheet_server import SheetServer
+from benchmarks.synthetic import generate_csv
+from components import data_loader
+
+@pytest.fixture
+def raw():
+    return generate_csv(200, ams_per_witel=5)
+
+def serve(monkeypatch, tmp_path, raw, **kwargs):
+    """Jalankan SheetServer dan arahkan data_loader ke server itu dan folder snapshot sementara"""
+    server = SheetServer(raw, **kwargs).start()
+    monkeypatch.setattr(data_loader, "SHEET_EXPORT_URL", server.url)
+    monkeypatch.setattr(data_loader, "SNAPSHOT_DIR", tmp_path)
+    return server
+
+@pytest.fixture
+def server(monkeypatch, tmp_path, raw):
+    server = serve(monkeypatch, tmp_path, raw)
+    yield server
+    server.stop()
+
+@pytest.fixture
+def server_without_etag(monkeypatch, tmp_path, raw):
+    server = serve(monkeypatch, tmp_path, raw, etag=False)
+    yield server
+    server.stop()
@@ -0,0 +1,144 @@
+"""
+Kalkulasi berbasis cube (aggregates.py) harus memberi angka yang sama dengan kode pandas
+per kategori/produk/AM yang digantikannya (reference_* di bawah, disalin dari versi awal dashboard).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_csv
+from components.aggregates import CATEGORY_COLUMN, build_cube, resummarize_witel, summarize_ams, summarize_witel
+from components.data_loader import parse_sheet
+from components.viz_piechart import calculate_category_breakdown, calculate_category_stats, calculate_category_win_lose
+
+EMPTY_CATEGORY = "KATEGORI KOSONG"
+
+def reference_breakdown(df, category):
+    category_data = df[df[CATEGORY_COLUMN] == category].copy()
+    if len(category_data) == 0:
+        return None
+    product_breakdown = {}
+    total_products = len(category_data)
+    for product_name in category_data['PRODUCT'].unique():
+        product_data = category_data[category_data['PRODUCT'] == product_name]
+        count = len(product_data)
+        product_breakdown[product_name] = {
+            'count': count,
+            'percentage': (count / total_products) * 100,
+            'avg_result': product_data['% Results'].mean(),
+        }
+    return product_breakdown
+
+def reference_win_lose(df, category):
+    category_data = df[df[CATEGORY_COLUMN] == category]
+    if len(category_data) > 0:
+        valid_results = category_data['% Results'].dropna()
+        if len(valid_results) > 0:
+            avg_result = valid_results.mean()
+            return avg_result, 100 - avg_result, len(category_data)
+    return 0, 100, 0
+
+def reference_am_groups(df):
+    # Sheet asli berisi teks (bukan categorical): hanya AM yang muncul di data
+    am_groups = df.groupby('AM', observed=True).agg({
+        'CUSTOMER_NAME': 'nunique',
+        'PRODUCT': 'count',
+        'NILAI': 'sum',
+        '% Progress': 'mean',
+    }).reset_index()
+    am_groups.columns = ['AM', 'Total_Customers', 'Total_Products', 'Total_Nilai', 'Avg_Progress']
+    return am_groups.sort_values('Total_Nilai', ascending=False)
+
+def assert_close(actual, expected, path=""):
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected), path
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}/{key}")
+    elif isinstance(expected, (float, np.floating)) and math.isnan(expected):
+        assert math.isnan(actual), path
+    else:
+        assert actual == pytest.approx(expected, rel=1e-6), path
+
+def assert_am_groups_equal(actual, expected):
+    # Urutan AM dengan Total_Nilai sama tidak ditentukan (sort tidak stabil), bandingkan per AM
+    def by_am(frame):
+        return frame.assign(AM=frame['AM'].astype(str)).set_index('AM').sort_index()
+
+    assert actual['Total_Nilai'].is_monotonic_decreasing
+    pd.testing.assert_frame_equal(by_am(actual), by_am(expected), check_dtype=False, rtol=1e-6)
+
+@pytest.fixture(scope="module")
+def witel_df():
+    df = parse_sheet(generate_csv(3000, ams_per_witel=4, seed=7))
+    df = df[df['WITEL'] == df['WITEL'].iloc[0]].reset_index(drop=True)
+    # Kategori tanpa baris (ada di categories, tidak ada di data)
+    df[CATEGORY_COLUMN] = df[CATEGORY_COLUMN].cat.add_categories([EMPTY_CATEGORY])
+    # % Progress dan % Results NaN di sebagian baris, satu kategori tanpa % Results sama sekali
+    df.loc[::3, '% Progress'] = np.nan
+    df.loc[::5, '% Results'] = np.nan
+    first_category = df[CATEGORY_COLUMN].iloc[0]
+    df.loc[df[CATEGORY_COLUMN] == first_category, '% Results'] = np.nan
+    # Satu AM tanpa % Progress sama sekali
+    df.loc[df['AM'] == df['AM'].iloc[1], '% Progress'] = np.nan
+    return df
+
+def categories_of(df):
+    return list(df[CATEGORY_COLUMN].cat.categories)
+
+def test_category_win_lose_matches_reference(witel_df):
+    stats = calculate_category_stats(witel_df)
+    for category in categories_of(witel_df):
+        expected = reference_win_lose(witel_df, category)
+        assert_close(calculate_category_win_lose(witel_df, category), expected, category)
+        assert_close(calculate_category_win_lose(witel_df, category, stats), expected, category)
+    assert calculate_category_win_lose(witel_df, EMPTY_CATEGORY) == (0, 100, 0)
+
+def test_category_breakdown_matches_reference(witel_df):
+    stats = calculate_category_stats(witel_df)
+    for category in categories_of(witel_df):
+        expected = reference_breakdown(witel_df, category)
+        if expected is None:
+            assert calculate_category_breakdown(witel_df, category, stats) is None
+        else:
+            assert_close(calculate_category_breakdown(witel_df, category, stats), expected, category)
+    assert calculate_category_breakdown(witel_df, EMPTY_CATEGORY) is None
+
+def test_category_order_follows_first_appearance(witel_df):
+    assert list(calculate_category_stats(witel_df)) == list(witel_df[CATEGORY_COLUMN].dropna().unique())
+
+def test_am_aggregation_matches_reference(witel_df):
+    am_groups = summarize_ams(build_cube(witel_df))
+    assert_am_groups_equal(am_groups, reference_am_groups(witel_df))
+    assert am_groups['Avg_Progress'].isna().sum() == 1
+
+def test_witel_summary_matches_reference(witel_df):
+    summary = summarize_witel(build_cube(witel_df))
+
+    assert summary['total_records'] == len(witel_df)
+    assert summary['avg_result'] == pytest.approx(witel_df['% Results'].dropna().mean())
+    assert summary['avg_progress'] == pytest.approx(witel_df['% Progress'].dropna().mean())
+    assert summary['total_customers'] == witel_df['CUSTOMER_NAME'].nunique()
+    assert summary['categories'] == list(witel_df[CATEGORY_COLUMN].dropna().unique())
+    for category in summary['categories']:
+        win_rate, lose_rate, total = reference_win_lose(witel_df, category)
+        stats = summary['category_stats'][category]
+        assert_close((stats['win_rate'], stats['lose_rate'], stats['total_products']), (win_rate, lose_rate, total))
+        assert_close(stats['breakdown'], reference_breakdown(witel_df, category), category)
+    assert_am_groups_equal(summary['am_groups'], reference_am_groups(witel_df))
+
+def test_resummarize_matches_full_summary(witel_df):
+    summary = summarize_witel(build_cube(witel_df))
+    changed = witel_df.copy()
+    row = changed.index[changed['AM'] == changed['AM'].iloc[0]][0]
+    changed.loc[row, ['% Progress', '% Results', 'NILAI']] = [55.0, 80.0, 1e12]
+    category, am = changed.loc[row, CATEGORY_COLUMN], changed.loc[row, 'AM']
+
+    cube = build_cube(changed)
+    updated = resummarize_witel(summary, cube, {category}, {am})
+    expected = summarize_witel(cube)
+
+    assert_close({k: v for k, v in updated.items() if k != 'am_groups'},
+                 {k: v for k, v in expected.items() if k != 'am_groups'})
+    pd.testing.assert_frame_equal(updated['am_groups'], expected['am_groups'])
@@ -0,0 +1,23 @@
+"""
+Gate budget performa (import dan rerun) sebagai test, sama dengan benchmarks.check_budget.
+Lewati di mesin yang lambat/bising dengan HIGHFIVE_SKIP_BUDGET=1.
+"""
+import os
+
+import pytest
+
+from benchmarks.check_budget import IMPORT_BUDGET_MS, RERUN_BUDGET_MS, measure_import, measure_reruns
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("HIGHFIVE_SKIP_BUDGET") == "1", reason="HIGHFIVE_SKIP_BUDGET=1"
+)
+
+def test_import_budget():
+    imported = measure_import()
+    assert imported['loaded'] == [], f"import berat tidak lazy: {imported['loaded']}"
+    assert imported['import_ms'] <= IMPORT_BUDGET_MS
+
+def test_rerun_budget():
+    timings = measure_reruns(rows=20000, witel="BALI", repeat=5)
+    over = {name: round(ms, 1) for name, ms in timings.items() if ms > RERUN_BUDGET_MS[name]}
+    assert not over, f"rerun melewati budget {RERUN_BUDGET_MS}: {over}"
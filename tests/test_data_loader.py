@@ -0,0 +1,99 @@
+"""
+Jalur conditional fetch load_sheet terhadap server HTTP lokal pengganti export Google Sheets.
+
+    python -m pytest tests
+"""
+import csv
+import io
+import math
+
+from benchmarks.synthetic import generate_csv
+from components import data_loader
+
+SOURCE = "DPS"
+
+# Token kosong/tak hingga yang diperlakukan berbeda oleh default pandas dan pyarrow
+NA_TOKENS = ['None', '<NA>', 'NULL', 'null', 'n/a', '#N/A', 'nan', '-NaN', 'inf', '-inf', '+inf', 'Infinity', 'INF', '']
+
+def fail_parse(raw):
+    raise AssertionError("sheet tidak berubah, seharusnya tidak di-parse ulang")
+
+def test_not_modified_reuses_snapshot(server, monkeypatch):
+    df, first = data_loader.load_sheet(SOURCE, max_age=0)
+    assert server.requests == 1 and first['etag'] == server.etag
+
+    monkeypatch.setattr(data_loader, "parse_sheet", fail_parse)
+    again, meta = data_loader.load_sheet(SOURCE, max_age=0)
+
+    assert server.requests == 2 and server.not_modified == 1
+    assert again.equals(df)
+    assert meta['sha256'] == first['sha256'] and meta['fetched_at'] >= first['fetched_at']
+
+def test_same_digest_without_etag_skips_parse(server_without_etag, monkeypatch):
+    df, first = data_loader.load_sheet(SOURCE, max_age=0)
+    assert first['etag'] is None
+
+    monkeypatch.setattr(data_loader, "parse_sheet", fail_parse)
+    again, meta = data_loader.load_sheet(SOURCE, max_age=0)
+
+    assert server_without_etag.requests == 2 and server_without_etag.not_modified == 0
+    assert again.equals(df)
+    assert meta['sha256'] == first['sha256']
+
+def test_changed_sheet_is_parsed_again(server, raw):
+    df, first = data_loader.load_sheet(SOURCE, max_age=0)
+    server.set_content(generate_csv(300, ams_per_witel=5))
+
+    again, meta = data_loader.load_sheet(SOURCE, max_age=0)
+
+    assert len(df) == 200 and len(again) == 300
+    assert server.not_modified == 0
+    assert meta['etag'] == server.etag and meta['sha256'] != first['sha256']
+
+def test_failed_snapshot_write_still_returns_new_version(server, monkeypatch):
+    _, first = data_loader.load_sheet(SOURCE, max_age=0)
+    server.set_content(generate_csv(300, ams_per_witel=5))
+
+    def fail_write(data_source, df):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(data_loader, "write_snapshot", fail_write)
+    df, meta = data_loader.load_sheet(SOURCE, max_age=0)
+
+    # Meta di disk masih versi lama, meta yang dikembalikan milik isi df
+    assert len(df) == 300
+    assert data_loader.read_meta(SOURCE)['sha256'] == first['sha256']
+    assert meta['sha256'] != first['sha256']
+
+def test_snapshot_vanished_after_not_modified(server, monkeypatch):
+    df, first = data_loader.load_sheet(SOURCE, max_age=0)
+    download = data_loader.download_sheet
+
+    def download_then_lose_snapshot(data_source, meta=None):
+        # Snapshot dihapus (misal tombol refresh di session lain) setelah server menjawab 304
+        result = download(data_source, meta)
+        data_loader.snapshot_path(data_source).unlink(missing_ok=True)
+        return result
+
+    monkeypatch.setattr(data_loader, "download_sheet", download_then_lose_snapshot)
+    again, meta = data_loader.load_sheet(SOURCE, max_age=0)
+
+    # 304 lalu download penuh tanpa header conditional
+    assert server.not_modified == 1 and server.requests == 3
+    assert again.equals(df) and meta['sha256'] == first['sha256']
+
+def test_fast_parser_matches_pandas_on_na_tokens():
+    rows = list(csv.reader(io.StringIO(generate_csv(60, ams_per_witel=3).decode())))
+    header = [name.strip() for name in rows[0]]
+    for row, token in zip(rows[1:], NA_TOKENS):
+        for name in ('NILAI', '% Progress', '% Results', 'AM', 'PRODUCT'):
+            row[header.index(name)] = token
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    raw = buf.getvalue().encode()
+
+    fast = data_loader.parse_sheet_fast(raw)
+
+    assert fast.equals(data_loader.parse_sheet_pandas(raw))
+    assert fast['NILAI'].head(len(NA_TOKENS)).isna().sum() == 9
+    assert math.isinf(fast.loc[NA_TOKENS.index('Infinity'), '% Results'])
@@ -0,0 +1,57 @@
+from benchmarks.synthetic import generate_csv
+from components import data_loader
+from components.data_refresher import SheetRefresher
+
+SOURCE = "DPS"
+
+def test_changed_sheet_is_served_when_snapshot_write_fails(server, monkeypatch):
+    refresher = SheetRefresher()
+    assert len(refresher.get(SOURCE).frame) == 200
+
+    def fail_write(data_source, df):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(data_loader, "write_snapshot", fail_write)
+    server.set_content(generate_csv(300, ams_per_witel=5))
+    refresher.refresh_all()
+
+    assert len(refresher.get(SOURCE).frame) == 300
+    assert refresher.timings[SOURCE]['kind'] != 'unchanged'
+    assert refresher.last_error(SOURCE) is None
+
+def test_forced_refresh_downloads_without_conditional_headers(server):
+    refresher = SheetRefresher()
+    refresher.get(SOURCE)
+    requests = server.requests
+
+    refresher.refresh_all(force=True)
+
+    assert server.requests == requests + len(data_loader.SHEET_CONFIGS)
+    assert server.not_modified == 0
+    assert refresher.timings[SOURCE]['kind'] == 'unchanged'
+
+def test_failed_forced_refresh_keeps_snapshot(server, monkeypatch):
+    refresher = SheetRefresher()
+    dataset = refresher.get(SOURCE)
+
+    def fail_download(data_source, meta=None):
+        raise OSError("jaringan putus")
+
+    monkeypatch.setattr(data_loader, "download_sheet", fail_download)
+    refresher.refresh_all(force=True)
+
+    assert isinstance(refresher.last_error(SOURCE), OSError)
+    assert refresher.get(SOURCE) is dataset
+    assert data_loader.snapshot_path(SOURCE).exists()
+
+def test_successful_get_clears_warm_up_error(server, monkeypatch):
+    url = data_loader.SHEET_EXPORT_URL
+    monkeypatch.setattr(data_loader, "SHEET_EXPORT_URL", "http://127.0.0.1:9/{sheet_id}.csv")
+    refresher = SheetRefresher()
+    for future in refresher.warm_up():
+        future.result()
+    assert refresher.last_error(SOURCE) is not None
+
+    monkeypatch.setattr(data_loader, "SHEET_EXPORT_URL", url)
+    assert len(refresher.get(SOURCE).frame) == 200
+    assert refresher.last_error(SOURCE) is None
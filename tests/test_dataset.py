@@ -0,0 +1,146 @@
+"""
+Dataset(previous=...) membangun ulang hanya WITEL/kategori/AM yang berubah;
+hasilnya harus sama dengan Dataset yang dibangun penuh dari frame yang sama.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_csv
+from components.aggregates import CATEGORY_COLUMN
+from components.data_loader import parse_sheet
+from components.dataset import Dataset
+
+SOURCE = "DPS"
+
+@pytest.fixture(scope="module")
+def base():
+    return parse_sheet(generate_csv(1500, ams_per_witel=5))
+
+def assert_same(a, b, path, strict=True):
+    if isinstance(a, dict):
+        assert list(a) == list(b), path
+        for key in a:
+            assert_same(a[key], b[key], f"{path}/{key}", strict)
+    elif isinstance(a, pd.DataFrame):
+        # Ringkasan yang dibawa dari versi lama bisa punya kategori AM lebih sedikit (nilainya sama)
+        pd.testing.assert_frame_equal(a, b, check_dtype=strict, check_categorical=strict, obj=path)
+    elif isinstance(a, float) and np.isnan(a):
+        assert isinstance(b, float) and np.isnan(b), path
+    else:
+        assert a == b, path
+
+def rebuild(previous_frame, frame):
+    """Dataset delta dari versi sebelumnya (ringkasan dan urutan sort sudah dihitung) dan Dataset penuh"""
+    previous = Dataset(SOURCE, previous_frame, 'v0')
+    for witel in previous.witels:
+        previous.summary(witel)
+        previous.sort_order(witel, ['AM'])
+    return Dataset(SOURCE, frame, 'v1', previous=previous), Dataset(SOURCE, frame, 'v1')
+
+def assert_matches_full_rebuild(delta, full):
+    assert delta.delta is not None
+    assert delta.witels == full.witels
+    for witel in full.witels:
+        assert_same(delta.summary(witel), full.summary(witel), witel, strict=witel in delta.delta['witels'])
+        assert (delta.sort_order(witel, ['AM']) == full.sort_order(witel, ['AM'])).all()
+        assert delta.for_witel(witel).equals(full.for_witel(witel))
+
+def witel_rows(frame, witel):
+    return frame.index[frame['WITEL'] == witel]
+
+def test_modified_row(base):
+    frame = base.copy()
+    frame.loc[5, '% Progress'] = 12.5
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert delta.delta['witels'] == {frame.loc[5, 'WITEL']}
+    assert (delta.delta['added'], delta.delta['removed'], delta.delta['modified']) == (0, 0, 1)
+    # WITEL lain tidak berubah: revisinya tetap versi lama (cache figure tetap hit)
+    other = next(witel for witel in full.witels if witel != frame.loc[5, 'WITEL'])
+    assert delta.revision(other) == 'v0' and delta.revision(frame.loc[5, 'WITEL']) == 'v1'
+
+def test_added_row(base):
+    frame = pd.concat([base.iloc[:100], base.iloc[[3]], base.iloc[100:]], ignore_index=True)
+    frame.loc[100, 'CUSTOMER_NAME'] = base.loc[0, 'CUSTOMER_NAME']
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (delta.delta['added'], delta.delta['removed']) == (1, 0)
+
+def test_removed_rows(base):
+    frame = base.drop(index=[7, 400]).reset_index(drop=True)
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (delta.delta['added'], delta.delta['removed'], delta.delta['modified']) == (0, 2, 0)
+
+def test_category_changed(base):
+    frame = base.copy()
+    categories = frame[CATEGORY_COLUMN].cat.categories
+    frame.loc[11, CATEGORY_COLUMN] = categories[0] if frame.loc[11, CATEGORY_COLUMN] != categories[0] else categories[1]
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert len(delta.delta['categories']) == 2
+
+def test_rows_reordered_within_witel(base):
+    frame = base.copy()
+    first, second = witel_rows(frame, frame.loc[0, 'WITEL'])[:2]
+    frame.iloc[[first, second]] = frame.iloc[[second, first]].to_numpy()
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert delta.delta['witels'] == {frame.loc[0, 'WITEL']}
+
+def test_witel_disappears(base):
+    gone = base.loc[0, 'WITEL']
+    frame = base.drop(index=witel_rows(base, gone)).reset_index(drop=True)
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert gone not in delta.witels
+    assert delta.for_witel(gone).empty
+
+def test_am_disappears(base):
+    witel, am = base.loc[0, 'WITEL'], base.loc[0, 'AM']
+    frame = base[base['AM'] != am].reset_index(drop=True)
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (witel, am) in delta.delta['ams']
+    assert am not in set(delta.summary(witel)['am_groups']['AM'])
+
+def test_new_am(base):
+    frame = base.copy()
+    frame['AM'] = frame['AM'].cat.add_categories(['ZZ AM BARU'])
+    frame.loc[20, 'AM'] = 'ZZ AM BARU'
+    delta, full = rebuild(base, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (frame.loc[20, 'WITEL'], 'ZZ AM BARU') in delta.delta['ams']
+
+def test_duplicate_row_key(base):
+    # Dua baris dengan ROW_KEY sama (produk sama untuk customer yang sama), hanya satu yang berubah
+    twin = base.iloc[[3]].assign(NILAI=base.loc[3, 'NILAI'] + 1000)
+    previous = pd.concat([base, twin], ignore_index=True)
+    frame = previous.copy()
+    frame.loc[len(frame) - 1, '% Progress'] = 77.0
+    delta, full = rebuild(previous, frame)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (delta.delta['added'], delta.delta['removed'], delta.delta['modified']) == (0, 0, 1)
+
+def test_identical_duplicate_row_removed(base):
+    previous = pd.concat([base, base.iloc[[3]]], ignore_index=True)
+    delta, full = rebuild(previous, base)
+
+    assert_matches_full_rebuild(delta, full)
+    assert (delta.delta['added'], delta.delta['removed']) == (0, 1)
+
+def test_unchanged_frame_reuses_everything(base):
+    delta, full = rebuild(base, base.copy())
+
+    assert_matches_full_rebuild(delta, full)
+    assert delta.delta['witels'] == set() and delta.delta['ams'] == set()
@@ -0,0 +1,47 @@
+import threading
+
+from components.fragment_cache import FragmentCache
+
+def test_thread_stats_only_count_own_thread():
+    cache = FragmentCache()
+    cache.get('a', str, 1)
+    cache.get('a', str, 1)
+
+    def other_session():
+        cache.get('a', str, 1)
+        cache.get('b', str, 2)
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    thread.join()
+
+    assert cache.thread_stats() == {'hits': 1, 'misses': 1}
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 2
+
+def test_lru_evicts_least_recently_used():
+    cache = FragmentCache(maxsize=2)
+    built = []
+
+    def build(key):
+        built.append(key)
+        return f"<div>{key}</div>"
+
+    cache.get('a', build, 'a')
+    cache.get('b', build, 'b')
+    cache.get('a', build, 'a')   # hit, 'a' jadi yang terbaru
+    cache.get('c', build, 'c')   # 'b' yang paling lama tidak dipakai dibuang
+    assert built == ['a', 'b', 'c']
+
+    cache.get('a', build, 'a')   # masih ada
+    cache.get('b', build, 'b')   # dibangun ulang, 'c' dibuang
+    assert built == ['a', 'b', 'c', 'b']
+    assert cache.stats() == {'hits': 2, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+def test_counters_and_clear():
+    cache = FragmentCache(maxsize=10)
+    for value in [1, 2, 1, 1, 3]:
+        assert cache.get(('card', value), str, value) == str(value)
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'size': 3, 'maxsize': 10}
+
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 10}
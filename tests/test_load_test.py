@@ -0,0 +1,10 @@
+from benchmarks.load_test import percentile
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 95) == 10
+    assert percentile(values, 99) == 10
+    assert percentile([7], 50) == 7
+    assert percentile(list(range(1, 101)), 99) == 99
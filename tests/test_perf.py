@@ -0,0 +1,43 @@
+import cProfile
+
+from streamlit.testing.v1 import AppTest
+
+from components import perf
+
+class ExclusiveProfile(cProfile.Profile):
+    """Seperti Python >= 3.12: enable() gagal selama profiler lain masih aktif"""
+    active = []
+
+    def enable(self, *args, **kwargs):
+        if self.active:
+            raise ValueError("Another profiling tool is already active")
+        self.active.append(self)
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        if self in self.active:
+            self.active.remove(self)
+
+def _aborted_rerun_script():
+    import streamlit as st
+
+    from components import perf
+
+    perf.begin_rerun()
+    if st.session_state.get('abort', True):
+        # Seperti tombol DPS/DGS dan Card/Table: st.rerun sebelum finish_rerun
+        st.session_state.abort = False
+        st.rerun()
+    st.session_state.record = perf.finish_rerun()
+
+def test_aborted_rerun_does_not_leave_profiler_enabled(monkeypatch):
+    monkeypatch.setattr(perf, "PERF_PROFILE", True)
+    monkeypatch.setattr(perf.cProfile, "Profile", ExclusiveProfile)
+
+    at = AppTest.from_function(_aborted_rerun_script, default_timeout=30)
+    at.run()
+
+    assert not at.exception
+    assert at.session_state.record['rerun'] == 1
+    assert ExclusiveProfile.active == []
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import generate_csv
+from components.aggregates import build_cube, summarize_ams
+from components.data_loader import parse_sheet
+from components.viz_table import CARD_PAGE_SIZE, group_card_rows
+
+def test_group_card_rows_keeps_order_of_appearance():
+    df = pd.DataFrame({
+        'AM': ['B', 'A', 'B', 'B', 'A'],
+        'CUSTOMER_NAME': ['PT Y', 'PT X', 'PT Z', 'PT Y', np.nan],
+        'PRODUCT': ['P1', 'P2', 'P3', 'P4', 'P5'],
+        'NILAI': [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+    groups = group_card_rows(df)
+
+    assert list(groups) == ['B', 'A']
+    assert list(groups['B']) == ['PT Y', 'PT Z']
+    assert [product[0] for product in groups['B']['PT Y']] == ['P1', 'P4']
+    # Customer kosong jadi '-', kolom yang tidak ada di df diisi NaN
+    assert list(groups['A']) == ['PT X', '-']
+    product, nilai, progress, result, status = groups['A']['-'][0]
+    assert (product, nilai) == ('P5', 5.0)
+    assert all(pd.isna(value) for value in (progress, result, status))
+
+def _card_mode_script():
+    import streamlit as st
+
+    from components.viz_table import render_card_mode
+
+    render_card_mode(st.session_state.card_df, st.session_state.card_am_groups)
+
+def toggle_ams(at):
+    return [toggle.label.split('**')[1] for toggle in at.toggle]
+
+def test_card_mode_pages_ams_across_page_boundaries():
+    df = parse_sheet(generate_csv(3000, ams_per_witel=45))
+    df = df[df['WITEL'] == 'BALI']
+    am_groups = summarize_ams(build_cube(df))
+    ams = [str(am) for am in am_groups['AM']]
+    assert 2 * CARD_PAGE_SIZE < len(ams) < 3 * CARD_PAGE_SIZE
+
+    at = AppTest.from_function(_card_mode_script, default_timeout=30)
+    at.session_state.card_df = df
+    at.session_state.card_am_groups = am_groups
+    at.run()
+    assert toggle_ams(at) == ams[:CARD_PAGE_SIZE]
+    assert at.button(key="card_prev").disabled
+
+    at.button(key="card_next").click().run()
+    assert toggle_ams(at) == ams[CARD_PAGE_SIZE:2 * CARD_PAGE_SIZE]
+
+    at.button(key="card_next").click().run()
+    assert toggle_ams(at) == ams[2 * CARD_PAGE_SIZE:]
+    assert at.button(key="card_next").disabled
+    assert f"AM {2 * CARD_PAGE_SIZE + 1}–{len(ams)} dari {len(ams)} · Halaman 3/3" in at.markdown[0].value
+
+    # Detail AM yang dibuka di halaman terakhir memuat semua customer-nya
+    last_am = ams[-1]
+    at.toggle(key=f"am_detail_{last_am}").set_value(True).run()
+    customers = df.loc[df['AM'] == last_am, 'CUSTOMER_NAME'].dropna().unique()
+    detail = "\n".join(markdown.value for markdown in at.markdown)
+    assert all(str(customer) in detail for customer in customers)
+    assert not at.exception